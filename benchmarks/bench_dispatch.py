@@ -0,0 +1,185 @@
+"""State writes over a simulated day of polls, broadcast vs field-keyed dispatch.
+
+The entities of a config entry are created by the platforms on a real
+``ProtexialCoordinator`` and registered as its listeners. The day is fed
+through ``async_set_updated_data``, each poll recorded in the request metrics
+and the scheduler as ``_async_update_data`` does, and every
+``async_write_ha_state`` the listeners make is counted, once with the status
+fields of each entity as its listener context and once with no context at
+all, every entity being then notified of every update.
+
+Run from the repository root with the development requirements installed:
+
+    python benchmarks/bench_dispatch.py
+"""
+
+import asyncio
+from pathlib import Path
+import random
+import sys
+import tempfile
+from types import MappingProxyType
+
+from homeassistant.config_entries import SOURCE_USER, ConfigEntry
+from homeassistant.const import CONF_SCAN_INTERVAL
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from custom_components.somfy_protexial import (  # noqa: E402
+    alarm_control_panel,
+    binary_sensor,
+    sensor,
+)
+from custom_components.somfy_protexial.const import (  # noqa: E402
+    API,
+    CONF_HOME_ZONES,
+    CONF_MIN_SCAN_INTERVAL,
+    CONF_NIGHT_ZONES,
+    COORDINATOR,
+    DEVICE_INFO,
+    DOMAIN,
+    ELEMENTS_COORDINATOR,
+    ApiType,
+    Page,
+    Zone,
+)
+from custom_components.somfy_protexial.coordinator import (  # noqa: E402
+    ProtexialCoordinator,
+    ProtexialElementsCoordinator,
+)
+from custom_components.somfy_protexial.metrics import RequestTiming  # noqa: E402
+from custom_components.somfy_protexial.protexial import SomfyProtexial  # noqa: E402
+from custom_components.somfy_protexial.scheduler import (  # noqa: E402
+    AdaptiveScheduler,
+    PollSpreader,
+)
+from custom_components.somfy_protexial.status import Status  # noqa: E402
+
+DAY = 24 * 3600
+PLATFORMS = [alarm_control_panel, binary_sensor, sensor]
+
+
+def day_trace(scan_interval=60, seed=42):
+    """A day of status snapshots: arm/disarm cycles, doors, gsm signal noise.
+
+    Each snapshot comes with the duration of the poll which read it.
+    """
+    rng = random.Random(seed)
+    night_on, night_off = 23 * 3600, 7 * 3600
+    away_on, away_off = int(8.5 * 3600), 18 * 3600
+    door_openings = {rng.randrange(0, DAY) for _ in range(20)}
+    status = Status()
+    trace = []
+    for now in range(0, DAY, scan_interval):
+        night = now >= night_on or now < night_off
+        away = away_on <= now < away_off
+        door = any(0 <= now - opened < 120 for opened in door_openings)
+        status = status.replace(
+            zoneA="on" if night or away else "off",
+            zoneB="on" if night or away else "off",
+            zoneC="on" if away else "off",
+            door="ko" if door else "ok",
+            recgsm=str(rng.choice([3, 4, 4, 4, 5])),
+        )
+        trace.append((status, rng.uniform(0.05, 0.4)))
+    return trace
+
+
+def config_entry(scan_interval):
+    """Options as saved by the config flow: night on A+B, home on A."""
+    return ConfigEntry(
+        data={
+            CONF_NIGHT_ZONES: Zone.A.value + Zone.B.value,
+            CONF_HOME_ZONES: Zone.A.value,
+            CONF_MIN_SCAN_INTERVAL: scan_interval,
+            CONF_SCAN_INTERVAL: scan_interval,
+        },
+        discovery_keys=MappingProxyType({}),
+        domain=DOMAIN,
+        minor_version=1,
+        options={},
+        source=SOURCE_USER,
+        title="bench",
+        unique_id=None,
+        version=1,
+    )
+
+
+async def create_entities(hass, entry):
+    """The coordinator and the enabled entities the platforms create for it."""
+    protexial = SomfyProtexial(
+        session=None, url="http://127.0.0.1", api_type=ApiType.PROTEXIAL
+    )
+    scheduler = AdaptiveScheduler(
+        floor=entry.data[CONF_MIN_SCAN_INTERVAL],
+        ceiling=entry.data[CONF_SCAN_INTERVAL],
+    )
+    coordinator = ProtexialCoordinator(
+        hass, entry, protexial, scheduler, PollSpreader()
+    )
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = {
+        API: protexial,
+        COORDINATOR: coordinator,
+        DEVICE_INFO: None,
+        ELEMENTS_COORDINATOR: ProtexialElementsCoordinator(hass, entry, coordinator),
+    }
+    entities = []
+    for platform in PLATFORMS:
+        await platform.async_setup_entry(hass, entry, entities.extend)
+    # Entities disabled by default are never added, so never listen
+    return coordinator, [
+        entity
+        for entity in entities
+        if isinstance(entity, CoordinatorEntity)
+        and entity.coordinator is coordinator
+        and entity.entity_registry_enabled_default
+    ]
+
+
+async def measure_writes(trace, scan_interval, broadcast):
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        entry = config_entry(scan_interval)
+        coordinator, entities = await create_entities(hass, entry)
+        writes = 0
+
+        def count_write():
+            nonlocal writes
+            writes += 1
+
+        for entity in entities:
+            entity.async_write_ha_state = count_write
+            if broadcast:
+                entity.coordinator_context = None
+            await entity.async_added_to_hass()
+        metrics = coordinator.protexial.metrics
+        for status, duration in trace:
+            timing = RequestTiming(Page.STATUS, "get", 0, status=200)
+            timing.total = duration
+            metrics.record_request(timing)
+            coordinator.scheduler.on_success(status, status.diff(coordinator.data))
+            coordinator.async_set_updated_data(status)
+        data = hass.data[DOMAIN].pop(entry.entry_id)
+        await data[ELEMENTS_COORDINATOR].async_shutdown()
+        await coordinator.async_shutdown()
+        await hass.async_stop(force=True)
+    return len(entities), writes
+
+
+def run(scan_interval=60):
+    trace = day_trace(scan_interval)
+    entities, broadcast = asyncio.run(measure_writes(trace, scan_interval, True))
+    _, keyed = asyncio.run(measure_writes(trace, scan_interval, False))
+    return {
+        "dispatch_polls": len(trace),
+        "dispatch_entities": entities,
+        "dispatch_broadcast_writes": broadcast,
+        "dispatch_keyed_writes": keyed,
+    }
+
+
+if __name__ == "__main__":
+    for name, value in run().items():
+        print(f"{name}: {value}")
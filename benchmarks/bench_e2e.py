@@ -0,0 +1,192 @@
+"""End to end cost of the client against a simulated box of each model.
+
+- per-poll wall and CPU time of ``get_status``
+- command to visible state latency of each alarm panel action
+- login round trips per command when the box drops the idle session, with
+  the client aware of the box timeout and without, and with the session kept
+  warm as the integration does within its keep-alive window
+- detection time of ``guess_and_set_api_type`` as run by the config flow
+
+The boxes run in a separate process so only the client CPU time is counted.
+Run from the repository root with the development requirements installed:
+
+    python benchmarks/bench_e2e.py
+"""
+
+import asyncio
+import logging
+from pathlib import Path
+import statistics
+import sys
+import time
+
+from aiohttp import TraceConfig
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from fake_box import FakeBox, running  # noqa: E402
+
+from custom_components.somfy_protexial.client_session import (  # noqa: E402
+    create_client_session,
+)
+from custom_components.somfy_protexial.const import ApiType, Page, Zone  # noqa: E402
+from custom_components.somfy_protexial.protexial import SomfyProtexial  # noqa: E402
+
+# Probing the other models on a box logs expected decoding errors
+logging.getLogger("custom_components.somfy_protexial").setLevel(logging.CRITICAL)
+
+SEED = 42
+# Bound on a command becoming visible in the status, so a regression fails
+COMMAND_TIMEOUT = 10
+USERNAME = "u"
+PASSWORD = "1234"
+
+# Alarm panel action -> client call, zones expected on once it's visible
+ALARM_ACTIONS = {
+    "disarm": (lambda api: api.disarm(), ""),
+    "arm_home": (lambda api: api.arm_zones([Zone.A]), "A"),
+    "arm_night": (lambda api: api.arm_zones([Zone.A, Zone.B]), "AB"),
+    "arm_away": (lambda api: api.arm(Zone.ABC), "ABC"),
+}
+
+
+def zones_on(status):
+    return "".join(zone for zone in "ABC" if status[f"zone{zone}"] == "on")
+
+
+async def wait_for_zones(protexial, expected):
+    while zones_on(await protexial.get_status()) != expected:
+        pass
+
+
+def request_counter(login_path):
+    """Trace config counting every request and the ones to the login page."""
+    counts = {"requests": 0, "logins": 0}
+
+    async def on_request_start(session, context, params):
+        counts["requests"] += 1
+        if params.url.path == login_path:
+            counts["logins"] += 1
+
+    trace_config = TraceConfig()
+    trace_config.on_request_start.append(on_request_start)
+    return trace_config, counts
+
+
+def client(session, port, model, detect=False):
+    return SomfyProtexial(
+        session=session,
+        url=f"http://127.0.0.1:{port}",
+        api_type=None if detect else model,
+        username=USERNAME,
+        password=PASSWORD,
+        codes=FakeBox(model, seed=SEED).card,
+    )
+
+
+async def measure_polls(port, model, polls):
+    session = create_client_session()
+    try:
+        protexial = client(session, port, model)
+        await protexial.get_status()
+        started, cpu_started = time.monotonic(), time.process_time()
+        for _ in range(polls):
+            await protexial.get_status()
+        elapsed = time.monotonic() - started
+        cpu = time.process_time() - cpu_started
+    finally:
+        await session.close()
+    return elapsed / polls, cpu / polls
+
+
+async def measure_commands(port, model, repeat):
+    session = create_client_session()
+    latencies = {action: [] for action in ALARM_ACTIONS}
+    try:
+        protexial = client(session, port, model)
+        await protexial.init()
+        for _ in range(repeat):
+            for action, (command, expected) in ALARM_ACTIONS.items():
+                started = time.monotonic()
+                await command(protexial)
+                await asyncio.wait_for(
+                    wait_for_zones(protexial, expected), COMMAND_TIMEOUT
+                )
+                latencies[action].append(time.monotonic() - started)
+        await protexial.logout()
+    finally:
+        await session.close()
+    return {action: statistics.median(values) for action, values in latencies.items()}
+
+
+async def measure_logins(port, model, commands, idle, mode):
+    login_path = FakeBox(model).api.get_page(Page.LOGIN)
+    trace_config, counts = request_counter(login_path)
+    session = create_client_session(trace_configs=[trace_config])
+    try:
+        protexial = client(session, port, model)
+        if mode != "unaware":
+            protexial.session_manager.idle_timeout = idle / 2
+        if mode == "warm":
+            protexial.session_manager.renew_margin = idle / 4
+        await protexial.init()
+        if mode == "warm":
+            # The commands all come within the keep-alive window
+            protexial.start_keep_alive()
+        counts.update(requests=0, logins=0)
+        for _ in range(commands):
+            await asyncio.sleep(idle)
+            await protexial.turn_light_on()
+        await protexial.logout()
+    finally:
+        await session.close()
+    return counts["logins"] / commands, counts["requests"] / commands
+
+
+async def measure_detection(port, model, repeat):
+    durations = []
+    for _ in range(repeat):
+        session = create_client_session()
+        try:
+            protexial = client(session, port, model, detect=True)
+            started = time.monotonic()
+            api_type = await protexial.guess_and_set_api_type()
+            await protexial.get_version()
+            durations.append(time.monotonic() - started)
+        finally:
+            await session.close()
+        if api_type != model:
+            raise AssertionError(f"Detected {api_type} instead of {model}")
+    return statistics.median(durations)
+
+
+def run(polls=500, repeat=5, commands=5, idle=0.2):
+    results = {}
+    for model in ApiType:
+        name = f"e2e_{model.value}"
+        with running("--model", model.value, "--seed", SEED) as port:
+            wall, cpu = asyncio.run(measure_polls(port, model, polls))
+            results[f"{name}_poll_wall_ms"] = round(wall * 1e3, 3)
+            results[f"{name}_poll_cpu_us"] = round(cpu * 1e6, 1)
+            latencies = asyncio.run(measure_commands(port, model, repeat))
+            for action, latency in latencies.items():
+                results[f"{name}_{action}_visible_ms"] = round(latency * 1e3, 2)
+            detection = asyncio.run(measure_detection(port, model, repeat))
+            results[f"{name}_detection_ms"] = round(detection * 1e3, 2)
+        # The box forgets idle sessions faster than the commands come in
+        timeout = idle / 2
+        for mode in ("unaware", "aware", "warm"):
+            with running(
+                "--model", model.value, "--seed", SEED, "--session-timeout", timeout
+            ) as port:
+                logins, requests = asyncio.run(
+                    measure_logins(port, model, commands, idle, mode)
+                )
+            results[f"{name}_login_round_trips_per_command_{mode}"] = round(logins, 2)
+            results[f"{name}_round_trips_per_command_{mode}"] = round(requests, 2)
+    return results
+
+
+if __name__ == "__main__":
+    for name, value in run().items():
+        print(f"{name}: {value}")
@@ -0,0 +1,69 @@
+"""Boxes polled per second and per CPU second by the headless fleet runner.
+
+The fake boxes run in a separate process so only the runner's CPU time is
+counted. Run from the repository root with the development requirements
+installed:
+
+    python benchmarks/bench_fleet.py
+"""
+
+import asyncio
+from pathlib import Path
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from fake_box import running  # noqa: E402
+
+from custom_components.somfy_protexial.const import ApiType  # noqa: E402
+from custom_components.somfy_protexial.fleet import Fleet  # noqa: E402
+
+
+async def poll_fleet(port, boxes, interval, duration):
+    configs = {
+        f"box{index}": {
+            "url": f"http://127.0.0.1:{port}/box{index}",
+            "api_type": ApiType.PROTEXIAL,
+        }
+        for index in range(boxes)
+    }
+    changes = 0
+    # The simulated boxes share a single host as behind a proxy, no per host limit
+    async with Fleet(configs, interval=interval, limit_per_host=0) as fleet:
+
+        async def consume():
+            nonlocal changes
+            async for _ in fleet.changes():
+                changes += 1
+
+        consumer = asyncio.create_task(consume())
+        # Skip the ramp up, boxes start spread over the first interval
+        await asyncio.sleep(interval)
+        polls, started, cpu_started = fleet.polls, time.monotonic(), time.process_time()
+        await asyncio.sleep(duration)
+        polls = fleet.polls - polls
+        elapsed = time.monotonic() - started
+        cpu = time.process_time() - cpu_started
+        failing = len(fleet.failing())
+        consumer.cancel()
+    return polls, elapsed, cpu, changes, failing
+
+
+def run(boxes=500, interval=1, duration=5):
+    with running("--farm", "--status-change-rate", 0.05) as port:
+        polls, elapsed, cpu, changes, failing = asyncio.run(
+            poll_fleet(port, boxes, interval, duration)
+        )
+    return {
+        "fleet_boxes": boxes,
+        "fleet_polls_per_s": round(polls / elapsed, 1),
+        "fleet_polls_per_cpu_s": round(polls / cpu, 1),
+        "fleet_changes": changes,
+        "fleet_failing_boxes": failing,
+    }
+
+
+if __name__ == "__main__":
+    for name, value in run().items():
+        print(f"{name}: {value}")
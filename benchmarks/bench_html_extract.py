@@ -0,0 +1,77 @@
+"""Cost of reading the challenge, error code and footer from the box pages.
+
+Compares the full PyQuery DOM with the per-model precompiled extractors on
+the fixture pages of each model. Run from the repository root with the
+development requirements installed:
+
+    python benchmarks/bench_html_extract.py
+"""
+
+from pathlib import Path
+import sys
+import timeit
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from custom_components.somfy_protexial.const import ApiType, Selector  # noqa: E402
+from custom_components.somfy_protexial.html_parser import (  # noqa: E402
+    extract_text,
+    parse_html,
+)
+from custom_components.somfy_protexial.protexial_api import ProtexialApi  # noqa: E402
+from custom_components.somfy_protexial.protexial_io_api import (  # noqa: E402
+    ProtexialIOApi,
+)
+from custom_components.somfy_protexial.protexiom_api import ProtexiomApi  # noqa: E402
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+APIS = {
+    ApiType.PROTEXIAL: ProtexialApi(),
+    ApiType.PROTEXIAL_IO: ProtexialIOApi(),
+    ApiType.PROTEXIOM: ProtexiomApi(),
+}
+
+PAGES = {
+    "login.htm": [Selector.LOGIN_CHALLENGE, Selector.FOOTER],
+    "error.htm": [Selector.ERROR_CODE],
+}
+
+
+def dom_text(content, selector):
+    return parse_html(content)(selector).text()
+
+
+def measure(function, number):
+    best = min(timeit.repeat(function, number=number, repeat=5))
+    return best / number * 1e6
+
+
+def run(number=500):
+    results = {}
+    total_before = total_after = 0
+    for api_type, api in APIS.items():
+        for page, selectors in PAGES.items():
+            content = (FIXTURES / api_type.value / page).read_bytes()
+            content = content.decode(api.get_encoding())
+            for selector in selectors:
+                css = api.get_selector(selector)
+                pattern = api.get_extractor(selector)
+                if dom_text(content, css) != extract_text(content, css, pattern):
+                    raise AssertionError(
+                        f"Extractors disagree on {api_type.value} {selector.value}"
+                    )
+                before = measure(lambda: dom_text(content, css), number)
+                after = measure(lambda: extract_text(content, css, pattern), number)
+                name = f"html_{api_type.value}_{selector.value}"
+                results[f"{name}_before_us"] = round(before, 2)
+                results[f"{name}_after_us"] = round(after, 2)
+                total_before += before
+                total_after += after
+    results["html_extract_speedup"] = round(total_before / total_after, 2)
+    return results
+
+
+if __name__ == "__main__":
+    for name, value in run().items():
+        print(f"{name}: {value}")
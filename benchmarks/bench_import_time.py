@@ -0,0 +1,57 @@
+"""Import cost of the protexial client and of the HTML parsing stack.
+
+Each module is imported in a fresh interpreter with ``python -X importtime``.
+Run from the repository root with the development requirements installed:
+
+    python benchmarks/bench_import_time.py
+"""
+
+from pathlib import Path
+import subprocess
+import sys
+
+ROOT = Path(__file__).resolve().parents[1]
+
+PROTEXIAL = "custom_components.somfy_protexial.protexial"
+# pyquery pulls lxml.etree in
+HTML_STACK = "pyquery"
+
+
+def import_times(module):
+    """Cumulative import time in microseconds of every module loaded."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def best_of(module, repeat=5):
+    return min(import_times(module)[module] for _ in range(repeat))
+
+
+def run(repeat=5):
+    protexial = min(
+        (import_times(PROTEXIAL) for _ in range(repeat)),
+        key=lambda times: times[PROTEXIAL],
+    )
+    return {
+        "import_protexial_us": protexial[PROTEXIAL],
+        "import_html_stack_us": best_of(HTML_STACK, repeat),
+        "import_html_stack_at_startup": HTML_STACK in protexial
+        or "lxml.etree" in protexial,
+    }
+
+
+if __name__ == "__main__":
+    for name, value in run().items():
+        print(f"{name}: {value}")
@@ -0,0 +1,102 @@
+"""Per-poll CPU cost of decoding status.xml, before and after the fast parser.
+
+Run from the repository root with the development requirements installed:
+
+    python benchmarks/bench_status_parser.py
+"""
+
+from pathlib import Path
+import string
+import sys
+import timeit
+from xml.etree import ElementTree as ET
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from custom_components.somfy_protexial.status import parse_status  # noqa: E402
+
+FIXTURE = Path(__file__).parent / "fixtures" / "status.xml"
+
+_PRINTABLE_CHARS = set(string.printable)
+
+
+class LegacyStatus:
+    zoneA = "off"
+    zoneB = "off"
+    zoneC = "off"
+    battery = "ok"
+    radio = "ok"
+    door = "ok"
+    alarm = "ok"
+    box = "ok"
+    gsm = "gsm connect au rseau"
+    recgsm = "4"
+    opegsm = "orange"
+    camera = "disabled"
+
+    def __str__(self):
+        return f"zoneA:{self.zoneA}, zoneB:{self.zoneB}, zoneC:{self.zoneC}, battery:{self.battery}, radio:{self.radio}, door:{self.door}, alarm:{self.alarm}, box:{self.box}, gsm:{self.gsm}, recgsm:{self.recgsm}, opegsm:{self.opegsm}, camera:{self.camera}"
+
+
+def legacy_filter_ascii(value):
+    if value is None:
+        return value
+    filtered = "".join(filter(lambda x: x in _PRINTABLE_CHARS, value))
+    return filtered.lower()
+
+
+def legacy_parse_status(content):
+    """The ElementTree + match implementation parse_status replaced."""
+    response = ET.fromstring(content)
+    status = LegacyStatus()
+    for child in response:
+        filteredChildText = legacy_filter_ascii(child.text)
+        match child.tag:
+            case "defaut0":
+                status.battery = filteredChildText
+            case "defaut1":
+                status.radio = filteredChildText
+            case "defaut2":
+                status.door = filteredChildText
+            case "defaut3":
+                status.alarm = filteredChildText
+            case "defaut4":
+                status.box = filteredChildText
+            case "zone0":
+                status.zoneA = filteredChildText
+            case "zone1":
+                status.zoneB = filteredChildText
+            case "zone2":
+                status.zoneC = filteredChildText
+            case "gsm":
+                status.gsm = filteredChildText
+            case "recgsm":
+                status.recgsm = filteredChildText
+            case "opegsm":
+                status.opegsm = filteredChildText
+            case "camera":
+                status.camera = filteredChildText
+    return status
+
+
+def measure(function, content, number):
+    best = min(timeit.repeat(lambda: function(content), number=number, repeat=5))
+    return best / number * 1e6
+
+
+def run(number=20000):
+    content = FIXTURE.read_bytes().decode("iso-8859-15")
+    if str(legacy_parse_status(content)) != str(parse_status(content)):
+        raise AssertionError("Parsers disagree on the fixture")
+    before = measure(legacy_parse_status, content, number)
+    after = measure(parse_status, content, number)
+    return {
+        "status_parse_before_us": round(before, 2),
+        "status_parse_after_us": round(after, 2),
+        "status_parse_speedup": round(before / after, 2),
+    }
+
+
+if __name__ == "__main__":
+    for name, value in run().items():
+        print(f"{name}: {value}")
@@ -0,0 +1,377 @@
+"""A local simulator of Protexial, Protexial IO and Protexiom boxes.
+
+It serves the page map of the chosen model, taken from the integration API
+classes: login challenge, single cookie session with idle expiry, error
+codes, status.xml and the pilotage side effects on it. Latency, HTTP
+failures and dropped connections can be injected.
+
+Run from the repository root with the development requirements installed:
+
+    python benchmarks/fake_box.py --model protexial --port 8080
+
+With --farm every first path segment is a box of its own, so one process
+serves as many boxes as needed: http://127.0.0.1:8080/<box>/status.xml
+"""
+
+import argparse
+import asyncio
+from contextlib import contextmanager
+import hashlib
+from pathlib import Path
+import random
+import re
+import secrets
+import socket
+import subprocess
+import sys
+import time
+from urllib.parse import parse_qsl
+
+from aiohttp import web
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from custom_components.somfy_protexial.const import (  # noqa: E402
+    ApiType,
+    Page,
+    SomfyError,
+    Zone,
+)
+from custom_components.somfy_protexial.protexial_api import ProtexialApi  # noqa: E402
+from custom_components.somfy_protexial.protexial_io_api import (  # noqa: E402
+    ProtexialIOApi,
+)
+from custom_components.somfy_protexial.protexiom_api import ProtexiomApi  # noqa: E402
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+APIS = {
+    ApiType.PROTEXIAL: ProtexialApi,
+    ApiType.PROTEXIAL_IO: ProtexialIOApi,
+    ApiType.PROTEXIOM: ProtexiomApi,
+}
+
+VERSIONS = {
+    ApiType.PROTEXIAL: "v8_1",
+    ApiType.PROTEXIAL_IO: "v13_2",
+    ApiType.PROTEXIOM: None,
+}
+
+STATUS = """<?xml version="1.0" encoding="{xml_encoding}"?>
+<response>
+<defaut0>{defaut0}</defaut0>
+<defaut1>{defaut1}</defaut1>
+<defaut2>{defaut2}</defaut2>
+<defaut3>{defaut3}</defaut3>
+<defaut4>{defaut4}</defaut4>
+<zone0>{zone0}</zone0>
+<zone1>{zone1}</zone1>
+<zone2>{zone2}</zone2>
+<gsm>GSM connecté au réseau</gsm>
+<recgsm>4</recgsm>
+<opegsm>"Orange</opegsm>
+<camera>disabled</camera>
+</response>
+"""
+
+CHALLENGE_COLUMNS = "ABCDEF"
+CHALLENGE_ROWS = "12345"
+MAX_LOGIN_ATTEMPTS = 3
+
+
+class FakeBox:
+    """State and pages of one simulated box."""
+
+    def __init__(
+        self,
+        model=ApiType.PROTEXIAL,
+        username="u",
+        password="1234",
+        session_timeout=300,
+        latency=0.0,
+        failure_rate=0.0,
+        drop_rate=0.0,
+        status_change_rate=0.0,
+        etag=True,
+        seed=None,
+    ) -> None:
+        self.model = ApiType(model)
+        self.api = APIS[self.model]()
+        self.encoding = self.api.get_encoding()
+        self.username = username
+        self.password = password
+        self.session_timeout = session_timeout
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.drop_rate = drop_rate
+        self.status_change_rate = status_change_rate
+        self.etag = etag
+        self.rng = random.Random(seed)
+        self.card = {
+            f"{column}{row}": f"{self.rng.randrange(10000):04d}"
+            for row in CHALLENGE_ROWS
+            for column in CHALLENGE_COLUMNS
+        }
+        self.challenge = None
+        self.session = None
+        self.last_seen = 0
+        self.login_attempts = 0
+        self.login_posts = 0
+        self.error = None
+        self.status = {f"defaut{index}": "ok" for index in range(5)}
+        self.status.update(zone0="off", zone1="off", zone2="off")
+        self.light = "off"
+        self.cover = "stop"
+        self.requests = 0
+        self.pages = {path: page for page, path in self.api.pages.items() if path}
+        self.commands = self.__commands()
+        model_fixtures = FIXTURES / self.model.value
+        self.templates = {
+            name: (model_fixtures / f"{name}.htm").read_bytes().decode(self.encoding)
+            for name in ("login", "error", "elements")
+        }
+
+    def __commands(self):
+        """Pilotage form -> side effect on the box state."""
+        commands = {}
+
+        def add(payload, effect):
+            commands[frozenset(payload.items())] = effect
+
+        for zone, field in [(Zone.A, "zone0"), (Zone.B, "zone1"), (Zone.C, "zone2")]:
+            add(self.api.get_arm_payload(zone), {field: "on"})
+        add(
+            self.api.get_arm_payload(Zone.ABC),
+            {"zone0": "on", "zone1": "on", "zone2": "on"},
+        )
+        add(
+            self.api.get_disarm_payload(),
+            {"zone0": "off", "zone1": "off", "zone2": "off"},
+        )
+        add(self.api.get_turn_light_on_payload(), {"light": "on"})
+        add(self.api.get_turn_light_off_payload(), {"light": "off"})
+        add(self.api.get_open_cover_payload(), {"cover": "open"})
+        add(self.api.get_close_cover_payload(), {"cover": "close"})
+        add(self.api.get_stop_cover_payload(), {"cover": "stop"})
+        return commands
+
+    def session_is_open(self):
+        if self.session is None:
+            return False
+        if time.monotonic() - self.last_seen > self.session_timeout:
+            self.session = None
+            return False
+        return True
+
+    async def handle(self, request: web.Request, path, prefix=""):
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.drop_rate and self.rng.random() < self.drop_rate:
+            request.transport.close()
+            raise web.HTTPInternalServerError()
+        if self.failure_rate and self.rng.random() < self.failure_rate:
+            raise web.HTTPInternalServerError()
+        page = self.pages.get(path)
+        if page is None:
+            raise web.HTTPNotFound()
+        form = {}
+        if request.method == "POST":
+            body = (await request.read()).decode("ascii", "replace")
+            form = dict(parse_qsl(body, keep_blank_values=True, encoding=self.encoding))
+
+        match page:
+            case Page.STATUS:
+                return self.status_response(request)
+            case Page.VERSION:
+                return web.Response(text=VERSIONS[self.model])
+            case Page.LOGIN:
+                if request.method == "POST":
+                    return self.login(form, prefix)
+                self.challenge = self.rng.choice(sorted(self.card))
+                return self.html(
+                    re.sub(
+                        r"<b>[A-F][1-5]</b>",
+                        f"<b>{self.challenge}</b>",
+                        self.templates["login"],
+                        count=1,
+                    )
+                )
+            case Page.ERROR:
+                if request.method == "POST" and form == (
+                    self.api.get_reset_session_payload()
+                ):
+                    self.session = None
+                    return self.redirect(prefix, Page.LOGIN)
+                return self.html(
+                    self.templates["error"].replace(
+                        SomfyError.WRONG_CODE.value, self.error or ""
+                    )
+                )
+            case Page.DEFAULT:
+                return self.html("<html><body>Somfy</body></html>")
+
+        # Every other page needs the session
+        cookie = request.headers.get("Cookie")
+        if cookie is None:
+            return self.fail(prefix, SomfyError.NOT_AUTHORIZED)
+        if not self.session_is_open() or cookie != self.session:
+            return self.redirect(prefix, Page.DEFAULT)
+        self.last_seen = time.monotonic()
+
+        match page:
+            case Page.LOGOUT:
+                self.session = None
+                return self.redirect(prefix, Page.LOGIN)
+            case Page.PILOTAGE:
+                if request.method == "POST":
+                    effect = self.commands.get(frozenset(form.items()))
+                    if effect is None:
+                        return self.fail(prefix, SomfyError.UNKNOWN_PARAMETER)
+                    for field, value in effect.items():
+                        if field in self.status:
+                            self.status[field] = value
+                        else:
+                            setattr(self, field, value)
+                return self.html("<html><body>Pilotage</body></html>")
+            case Page.ELEMENTS:
+                return self.html(self.templates["elements"])
+            case Page.CHALLENGE_CARD:
+                return self.html(self.challenge_card())
+        raise web.HTTPNotFound()
+
+    def login(self, form, prefix):
+        self.login_posts += 1
+        if self.login_attempts >= MAX_LOGIN_ATTEMPTS:
+            return self.fail(prefix, SomfyError.MAX_LOGIN_ATTEMPS)
+        if self.session_is_open():
+            return self.fail(prefix, SomfyError.SESSION_ALREADY_OPEN)
+        if form.get("login") != self.username or form.get("password") != self.password:
+            self.login_attempts += 1
+            return self.fail(prefix, SomfyError.WRONG_CREDENTIALS)
+        if self.challenge is None or form.get("key") != self.card[self.challenge]:
+            self.login_attempts += 1
+            return self.fail(prefix, SomfyError.WRONG_CODE)
+        self.login_attempts = 0
+        self.challenge = None
+        self.session = f"session-id={secrets.token_hex(8)}"
+        self.last_seen = time.monotonic()
+        response = self.html("<html><body>Pilotage</body></html>")
+        response.headers["Set-Cookie"] = self.session
+        return response
+
+    def status_response(self, request):
+        if self.status_change_rate and self.rng.random() < self.status_change_rate:
+            self.status["defaut2"] = "ko" if self.status["defaut2"] == "ok" else "ok"
+        body = STATUS.format(xml_encoding=self.encoding.upper(), **self.status)
+        body = body.encode(self.encoding)
+        response = web.Response(body=body, content_type="text/xml")
+        if self.etag:
+            etag = f'"{hashlib.md5(body).hexdigest()}"'
+            if request.headers.get("If-None-Match") == etag:
+                return web.Response(status=304, headers={"ETag": etag})
+            response.headers["ETag"] = etag
+        return response
+
+    def challenge_card(self):
+        header = "".join(f'<th class="col">{column}</th>' for column in "ABCDEF")
+        rows = "".join(
+            f'<tr><td class="row">{row}</td>'
+            + "".join(
+                f"<td>{self.card[column + row]}</td>" for column in CHALLENGE_COLUMNS
+            )
+            + "</tr>"
+            for row in CHALLENGE_ROWS
+        )
+        return (
+            f"<html><body><table><tr><th></th>{header}</tr>{rows}</table></body></html>"
+        )
+
+    def html(self, content):
+        return web.Response(
+            body=content.encode(self.encoding),
+            content_type="text/html",
+            charset=self.encoding,
+        )
+
+    def fail(self, prefix, error: SomfyError):
+        self.error = error.value
+        return self.redirect(prefix, Page.ERROR)
+
+    def redirect(self, prefix, page):
+        raise web.HTTPFound(prefix + self.api.get_page(page))
+
+
+def create_app(farm=False, **options):
+    """A single box, or a farm of identical boxes created on first request."""
+    boxes = {}
+
+    async def handle(request: web.Request):
+        if not farm:
+            box = boxes.setdefault(None, FakeBox(**options))
+            return await box.handle(request, request.path)
+        _, key, path = request.path.split("/", 2)
+        box = boxes.get(key)
+        if box is None:
+            box = boxes[key] = FakeBox(**options)
+        return await box.handle(request, f"/{path}", f"/{key}")
+
+    app = web.Application()
+    app["boxes"] = boxes
+    app.router.add_route("*", "/{tail:.*}", handle)
+    return app
+
+
+@contextmanager
+def running(*args, timeout=10):
+    """Run a fake box in its own process with the given CLI flags, yield its port.
+
+    Keeps the simulator CPU time out of the measures of the calling process.
+    """
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = subprocess.Popen(
+        [sys.executable, __file__, "--port", str(port), *map(str, args)],
+        stdout=subprocess.DEVNULL,
+    )
+    try:
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=1).close()
+                break
+            except OSError:
+                if server.poll() is not None or time.monotonic() > deadline:
+                    raise
+                time.sleep(0.05)
+        yield port
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--model", default=ApiType.PROTEXIAL.value)
+    parser.add_argument("--farm", action="store_true")
+    parser.add_argument("--username", default="u")
+    parser.add_argument("--password", default="1234")
+    parser.add_argument("--session-timeout", type=float, default=300)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--drop-rate", type=float, default=0.0)
+    parser.add_argument("--status-change-rate", type=float, default=0.0)
+    parser.add_argument("--no-etag", dest="etag", action="store_false")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+    options = vars(args)
+    host, port = options.pop("host"), options.pop("port")
+    app = create_app(**options)
+    if not args.farm:
+        box = FakeBox(**{key: value for key, value in options.items() if key != "farm"})
+        app["boxes"][None] = box
+        print(f"Challenge card: {box.card}")
+    web.run_app(app, host=host, port=port, print=None, access_log=None)
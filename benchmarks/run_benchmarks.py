@@ -0,0 +1,65 @@
+"""Run the benchmarks and write their results as JSON.
+
+Every ``bench_*.py`` module next to this file is run unless some are named.
+Run from the repository root with the development requirements installed:
+
+    python benchmarks/run_benchmarks.py --output results.json
+    python benchmarks/run_benchmarks.py e2e status_parser
+"""
+
+import argparse
+from datetime import datetime, timezone
+import importlib
+import json
+from pathlib import Path
+import platform
+import subprocess
+import sys
+import time
+
+BENCHMARKS = Path(__file__).parent
+
+
+def git_revision():
+    result = subprocess.run(
+        ["git", "rev-parse", "--short", "HEAD"],
+        cwd=BENCHMARKS,
+        capture_output=True,
+        text=True,
+    )
+    return result.stdout.strip() or None
+
+
+def run(names):
+    results = {}
+    for name in names:
+        module = importlib.import_module(f"bench_{name}")
+        print(f"Running {name}", file=sys.stderr)
+        started = time.monotonic()
+        results[name] = module.run()
+        results[name]["duration_s"] = round(time.monotonic() - started, 2)
+    return {
+        "revision": git_revision(),
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "benchmarks": results,
+    }
+
+
+if __name__ == "__main__":
+    available = sorted(
+        path.stem.removeprefix("bench_") for path in BENCHMARKS.glob("bench_*.py")
+    )
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("names", nargs="*", metavar="name", help=", ".join(available))
+    parser.add_argument("--output", type=Path, help="defaults to stdout")
+    args = parser.parse_args()
+    unknown = set(args.names) - set(available)
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+    report = json.dumps(run(args.names or available), indent=2)
+    if args.output is None:
+        print(report)
+    else:
+        args.output.write_text(report + "\n")
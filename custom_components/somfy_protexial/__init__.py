@@ -15,27 +15,41 @@ from homeassistant.const import (
     CONF_USERNAME,
     Platform,
 )
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers import aiohttp_client, device_registry as dr
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr, entity_registry as er
 from homeassistant.helpers.device_registry import CONNECTION_NETWORK_MAC
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.typing import ConfigType
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
+from .client_session import create_client_session
 from .const import (
     API,
     CONF_API_TYPE,
     CONF_CODES,
+    CONF_FINGERPRINT,
     CONF_HOME_ZONES,
+    CONF_KEEP_ALIVE_WINDOW,
+    CONF_MIN_SCAN_INTERVAL,
     CONF_MODES,
     CONF_NIGHT_ZONES,
+    CONF_WATCH_EVENTS,
     COORDINATOR,
+    DEFAULT_MIN_SCAN_INTERVAL,
+    DEFAULT_WATCH_EVENTS,
     DEVICE_INFO,
     DOMAIN,
+    ELEMENTS_COORDINATOR,
+    POLL_SPREADER,
+    SESSION_KEEP_ALIVE_WINDOW,
+    WATCHER,
     ApiType,
     Zone,
 )
+from .coordinator import ProtexialCoordinator, ProtexialElementsCoordinator
+from .metrics import request_trace_config
 from .protexial import SomfyProtexial
+from .scheduler import AdaptiveScheduler, PollSpreader
+from .watcher import StatusWatcher
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -46,6 +60,7 @@ PLATFORMS = [
     Platform.BINARY_SENSOR,
     Platform.COVER,
     Platform.LIGHT,
+    Platform.SENSOR,
 ]
 
 
@@ -56,13 +71,12 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     if hass.data.get(DOMAIN) is None:
         hass.data.setdefault(DOMAIN, {})
+    # Shared by every box so their polls don't fire together
+    spreader = hass.data[DOMAIN].setdefault(POLL_SPREADER, PollSpreader())
 
-    session = aiohttp_client.async_create_clientsession(hass)
-    _LOGGER.debug(f"CONF_URL:{entry.data.get(CONF_URL)}")
-    _LOGGER.debug(f"CONF_API_TYPE:{entry.data.get(CONF_API_TYPE)}")
-    _LOGGER.debug(f"CONF_USERNAME:{entry.data.get(CONF_USERNAME)}")
-    _LOGGER.debug(f"CONF_PASSWORD:{entry.data.get(CONF_PASSWORD)}")
-    _LOGGER.debug(f"CONF_CODES:{entry.data.get(CONF_CODES)}")
+    session = create_client_session(trace_configs=[request_trace_config()])
+    entry.async_on_unload(session.close)
+    _LOGGER.debug("CONF_API_TYPE:%s", entry.data.get(CONF_API_TYPE))
 
     protexial = SomfyProtexial(
         session=session,
@@ -71,30 +85,39 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         username=entry.data.get(CONF_USERNAME),
         password=entry.data.get(CONF_PASSWORD),
         codes=entry.data.get(CONF_CODES),
+        keep_alive_window=entry.data.get(
+            CONF_KEEP_ALIVE_WINDOW, SESSION_KEEP_ALIVE_WINDOW
+        ),
     )
 
+    if not await protexial.check_fingerprint(entry.data.get(CONF_FINGERPRINT)):
+        _LOGGER.info("Centrale changed since it was set up, detecting it again")
+        api_type = await protexial.guess_and_set_api_type()
+        version = await protexial.get_version()
+        hass.config_entries.async_update_entry(
+            entry,
+            data={
+                **entry.data,
+                CONF_API_TYPE: api_type,
+                ATTR_SW_VERSION: version,
+                CONF_FINGERPRINT: protexial.fingerprint,
+            },
+        )
+
     await protexial.init()
 
-    async def _get_status():
-        try:
-            status = await protexial.get_status()
-            _LOGGER.debug(status)
-        except Exception as err:
-            raise UpdateFailed(f"Error communicating with API: {err}")
-        return status
-
-    coordinator = DataUpdateCoordinator(
-        hass,
-        _LOGGER,
-        name="Somfy Protexial status update",
-        update_method=_get_status,
-        update_interval=timedelta(seconds=entry.data.get(CONF_SCAN_INTERVAL)),
+    scheduler = AdaptiveScheduler(
+        floor=entry.data.get(CONF_MIN_SCAN_INTERVAL, DEFAULT_MIN_SCAN_INTERVAL),
+        ceiling=entry.data.get(CONF_SCAN_INTERVAL),
     )
+    coordinator = ProtexialCoordinator(hass, entry, protexial, scheduler, spreader)
+    spreader.add(entry.entry_id)
+    entry.async_on_unload(lambda: spreader.remove(entry.entry_id))
 
     device_registry = dr.async_get(hass)
     device_registry.async_get_or_create(
         config_entry_id=entry.entry_id,
-        identifiers={(DOMAIN, "centrale")},
+        identifiers={(DOMAIN, entry.entry_id)},
         connections={(CONNECTION_NETWORK_MAC, entry.data.get(CONF_URL))},
         manufacturer="Somfy",
         name="Somfy Protexial",
@@ -103,7 +126,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     )
 
     device_info = DeviceInfo(
-        identifiers={(DOMAIN, "centrale")},
+        identifiers={(DOMAIN, entry.entry_id)},
         connections={(CONNECTION_NETWORK_MAC, entry.data.get(CONF_URL))},
         name="Somfy Protexial",
         manufacturer="Somfy",
@@ -111,15 +134,29 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         sw_version=entry.data.get(ATTR_SW_VERSION),
     )
 
+    watcher = None
+    if entry.data.get(CONF_WATCH_EVENTS, DEFAULT_WATCH_EVENTS):
+        watcher = StatusWatcher(hass, coordinator, entry)
+    elements_coordinator = ProtexialElementsCoordinator(hass, entry, coordinator)
+
     hass.data[DOMAIN][entry.entry_id] = {
         API: protexial,
         COORDINATOR: coordinator,
         DEVICE_INFO: device_info,
+        WATCHER: watcher,
+        ELEMENTS_COORDINATOR: elements_coordinator,
     }
 
     entry.async_on_unload(entry.add_update_listener(async_reload_entry))
 
     await coordinator.async_config_entry_first_refresh()
+    protexial.start_keep_alive()
+    if watcher is not None:
+        watcher.start()
+    # The element list isn't needed to start, don't delay the setup with it
+    entry.async_create_background_task(
+        hass, elements_coordinator.async_refresh(), f"{DOMAIN} elements refresh"
+    )
 
     hass.async_create_task(
         hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
@@ -129,6 +166,10 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    watcher = hass.data[DOMAIN][entry.entry_id][WATCHER]
+    if watcher is not None:
+        await watcher.stop()
+    await hass.data[DOMAIN][entry.entry_id][ELEMENTS_COORDINATOR].async_shutdown()
     api = hass.data[DOMAIN][entry.entry_id][API]
     await api.logout()
 
@@ -173,9 +214,28 @@ async def async_migrate_entry(hass: HomeAssistant, config_entry: ConfigEntry):
             del new[CONF_MODES]
             applyMigration = True
 
+        if config_entry.minor_version < 4:
+            # 1.4 introduces CONF_MIN_SCAN_INTERVAL, CONF_SCAN_INTERVAL becomes
+            # the slowest interval used while idle
+            new = {**config_entry.data} if new is None else new
+            new[CONF_MIN_SCAN_INTERVAL] = min(
+                DEFAULT_MIN_SCAN_INTERVAL, new[CONF_SCAN_INTERVAL]
+            )
+            applyMigration = True
+
+        if config_entry.minor_version < 5:
+            # 1.5 supports several boxes, identifiers are based on the entry
+            # and the box URL can only be configured once
+            new = {**config_entry.data} if new is None else new
+            await async_migrate_identifiers(hass, config_entry)
+            hass.config_entries.async_update_entry(
+                config_entry, unique_id=new[CONF_URL]
+            )
+            applyMigration = True
+
         if applyMigration:
             hass.config_entries.async_update_entry(
-                config_entry, data=new, minor_version=3, version=1
+                config_entry, data=new, minor_version=5, version=1
             )
             _LOGGER.debug(
                 "Migration to version %s.%s successful",
@@ -185,6 +245,26 @@ async def async_migrate_entry(hass: HomeAssistant, config_entry: ConfigEntry):
     return True
 
 
+async def async_migrate_identifiers(hass: HomeAssistant, config_entry: ConfigEntry):
+    prefix = f"{DOMAIN}_"
+
+    @callback
+    def migrate_unique_id(entity_entry: er.RegistryEntry):
+        if not entity_entry.unique_id.startswith(prefix):
+            return None
+        suffix = entity_entry.unique_id.removeprefix(prefix)
+        return {"new_unique_id": f"{config_entry.entry_id}_{suffix}"}
+
+    await er.async_migrate_entries(hass, config_entry.entry_id, migrate_unique_id)
+
+    device_registry = dr.async_get(hass)
+    device = device_registry.async_get_device(identifiers={(DOMAIN, "centrale")})
+    if device is not None:
+        device_registry.async_update_device(
+            device.id, new_identifiers={(DOMAIN, config_entry.entry_id)}
+        )
+
+
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Handle an options update."""
     await hass.config_entries.async_reload(entry.entry_id)
@@ -1,11 +1,24 @@
 from abc import ABC, abstractmethod
+import re
 
-from .const import Page, Selector
+from .client_const import Page, Selector
 
 
 class AbstractApi(ABC):
     pages = None
     selectors = None
+    # Fast paths for the selectors, a miss falls back to the DOM. Shared by
+    # the models, a model only overrides the ones its pages differ on
+    extractors = {
+        Selector.LOGIN_CHALLENGE: re.compile(
+            r"id=[\"']?form_id\b.*?<td[^>]*>\s*<b>([A-F][1-5])</b>", re.DOTALL
+        ),
+        # The <b> must be inside #infobox, not anywhere after it
+        Selector.ERROR_CODE: re.compile(
+            r"id=[\"']?infobox\b[^>]*>(?:(?!</div>).)*?<b>([^<]*)</b>", re.DOTALL
+        ),
+        Selector.FOOTER: re.compile(r"id=[\"']?menu_footer[^>]*>([^<]*)</\w+>"),
+    }
     encoding = None
 
     def get_page(self, page: Page):
@@ -14,6 +27,9 @@ class AbstractApi(ABC):
     def get_selector(self, selector: Selector):
         return self.selectors[selector]
 
+    def get_extractor(self, selector: Selector):
+        return self.extractors.get(selector)
+
     def get_encoding(self):
         return self.encoding
 
@@ -8,10 +8,9 @@ from homeassistant.components.alarm_control_panel import (
     CodeFormat,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import (
     API,
@@ -23,12 +22,15 @@ from .const import (
     DOMAIN,
     Zone,
 )
+from .entity import ProtexialEntity
 from .helper import int_to_zones
 
 DEFAULT_ALARM_NAME = "Alarme"
 ACTIVATION_ALARM_CODE = None
 ALARM_STATE = None
 
+ZONE_FIELDS = {Zone.A: "zoneA", Zone.B: "zoneB", Zone.C: "zoneC"}
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -45,17 +47,27 @@ async def async_setup_entry(
     arm_code = config_entry.data.get(CONF_ARM_CODE)
     alarms = []
     alarms.append(
-        ProtexialAlarm(device_info, coordinator, api, night_zones, home_zones, arm_code)
+        ProtexialAlarm(
+            config_entry.entry_id,
+            device_info,
+            coordinator,
+            api,
+            night_zones,
+            home_zones,
+            arm_code,
+        )
     )
     async_add_entities(alarms)
 
 
-class ProtexialAlarm(CoordinatorEntity, AlarmControlPanelEntity):
+class ProtexialAlarm(ProtexialEntity, AlarmControlPanelEntity):
+    status_fields = frozenset(ZONE_FIELDS.values())
+
     def __init__(
-        self, device_info, coordinator, api, night_zones, home_zones, arm_code
+        self, entry_id, device_info, coordinator, api, night_zones, home_zones, arm_code
     ) -> None:
         super().__init__(coordinator)
-        self._attr_unique_id = f"{DOMAIN}_control_alarm"
+        self._attr_unique_id = f"{entry_id}_control_alarm"
         self._attr_device_info = device_info
         self.coordinator = coordinator
         self.api = api
@@ -106,10 +118,6 @@ class ProtexialAlarm(CoordinatorEntity, AlarmControlPanelEntity):
         """Return the state of the alarm."""
         return self.__getCurrentState()
 
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        self.async_write_ha_state()
-
     def __getCurrentState(self):
         active_zones = Zone.NONE.value
         if self.coordinator.data.zoneA == "on":
@@ -136,27 +144,37 @@ class ProtexialAlarm(CoordinatorEntity, AlarmControlPanelEntity):
     async def async_alarm_disarm(self, code=None):
         self.check_arm_code(code)
         await self.api.disarm()
-        await self.coordinator.async_request_refresh()
+        await self.__set_expected_zones(Zone.ABC.value, "off")
 
     async def async_alarm_arm_home(self, code=None):
         self.check_arm_code(code)
         await self.__arm_zones(self.home_zones)
-        await self.coordinator.async_request_refresh()
+        await self.__set_expected_zones(self.home_zones, "on")
 
     async def async_alarm_arm_night(self, code=None):
         self.check_arm_code(code)
         await self.__arm_zones(self.night_zones)
-        await self.coordinator.async_request_refresh()
+        await self.__set_expected_zones(self.night_zones, "on")
 
     async def async_alarm_arm_away(self, code=None):
         self.check_arm_code(code)
         await self.api.arm(Zone.ABC)
-        await self.coordinator.async_request_refresh()
+        await self.__set_expected_zones(Zone.ABC.value, "on")
 
     def check_arm_code(self, code):
         if not self.arm_code == code:
             raise HomeAssistantError("Invalid code")
 
     async def __arm_zones(self, int_zones):
-        for zone in int_to_zones(int_zones):
-            await self.api.arm(zone)
+        await self.api.arm_zones(int_to_zones(int_zones))
+
+    async def __set_expected_zones(self, int_zones, state):
+        # The command went through, show its outcome without waiting for a poll
+        changes = {
+            field: state
+            for zone, field in ZONE_FIELDS.items()
+            if int_zones & zone.value
+        }
+        await self.coordinator.async_set_expected_data(
+            self.coordinator.data.replace(**changes)
+        )
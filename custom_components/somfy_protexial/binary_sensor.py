@@ -6,14 +6,32 @@ from homeassistant.components.binary_sensor import (
     BinarySensorEntity,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EntityCategory
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import BINARY_SENSORS, COORDINATOR, DEVICE_INFO, DOMAIN
+from .const import (
+    BINARY_SENSORS,
+    COORDINATOR,
+    DEVICE_INFO,
+    DOMAIN,
+    ELEMENTS_COORDINATOR,
+)
+from .coordinator import ProtexialElementsCoordinator
+from .elements import Element
+from .entity import ProtexialEntity
 
 _LOGGER = logging.getLogger(__name__)
 
+# Element field, name, device class, Element property the state is read from
+ELEMENT_SENSORS = [
+    ("battery", "Batterie", BinarySensorDeviceClass.BATTERY, "battery_low"),
+    ("tamper", "Autoprotection", BinarySensorDeviceClass.TAMPER, "tampered"),
+    ("radio", "Perte radio", BinarySensorDeviceClass.PROBLEM, "radio_lost"),
+]
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -24,20 +42,59 @@ async def async_setup_entry(
     device_info = hass.data[DOMAIN][config_entry.entry_id][DEVICE_INFO]
     sensors = []
     for sensor in BINARY_SENSORS:
-        sensors.append(ProtexialBinarySensor(device_info, coordinator, sensor))
+        sensors.append(
+            ProtexialBinarySensor(
+                config_entry.entry_id, device_info, coordinator, sensor
+            )
+        )
     async_add_entities(sensors)
 
+    elements_coordinator = hass.data[DOMAIN][config_entry.entry_id][
+        ELEMENTS_COORDINATOR
+    ]
+    known_elements = set()
 
-class ProtexialBinarySensor(CoordinatorEntity, BinarySensorEntity):
-    def __init__(self, device_info, coordinator, sensor: Any) -> None:
-        super().__init__(coordinator)
+    @callback
+    def add_new_elements() -> None:
+        sensors = []
+        for code, element in (elements_coordinator.data or {}).items():
+            if code in known_elements:
+                continue
+            known_elements.add(code)
+            sensors.extend(
+                ProtexialElementBinarySensor(
+                    config_entry.entry_id, elements_coordinator, element, sensor
+                )
+                for sensor in ELEMENT_SENSORS
+                if getattr(element, sensor[0])
+            )
+        if sensors:
+            async_add_entities(sensors)
+
+    add_new_elements()
+    config_entry.async_on_unload(
+        elements_coordinator.async_add_listener(add_new_elements)
+    )
+
+
+class ProtexialBinarySensor(ProtexialEntity, BinarySensorEntity):
+    def __init__(self, entry_id, device_info, coordinator, sensor: Any) -> None:
+        super().__init__(coordinator, [sensor["id"]])
         self._attr_id = f"{DOMAIN}_sensor_{sensor['id']}"
-        self._attr_unique_id = f"{DOMAIN}_sensor_{sensor['id']}"
+        self._attr_unique_id = f"{entry_id}_sensor_{sensor['id']}"
         self._attr_device_info = device_info
         if "entity_category" in sensor:
             self._attr_entity_category = sensor["entity_category"]
         self.coordinator = coordinator
         self.sensor = sensor
+        # Resolved once, these are read on every state write
+        self._field = sensor["id"]
+        self._on_if = sensor.get("on_if")
+        self._off_if = sensor.get("off_if")
+        self._icon_on = sensor["icon_on"]
+        self._icon_off = sensor["icon_off"]
+        self._state_on = sensor["state_on"]
+        self._state_off = sensor["state_off"]
 
     @property
     def name(self):
@@ -46,7 +103,7 @@ class ProtexialBinarySensor(CoordinatorEntity, BinarySensorEntity):
 
     @property
     def icon(self):
-        return self.sensor["icon_on"] if self.is_on else self.sensor["icon_off"]
+        return self._icon_on if self.is_on else self._icon_off
 
     @property
     def is_on(self) -> bool:
@@ -55,15 +112,61 @@ class ProtexialBinarySensor(CoordinatorEntity, BinarySensorEntity):
     @property
     def state(self):
         if self.is_on:
-            return self.sensor["state_on"]
-        return self.sensor["state_off"]
+            return self._state_on
+        return self._state_off
 
     @property
     def device_class(self) -> BinarySensorDeviceClass:
         self.sensor["device_class"]
 
     def __getCurrentState(self) -> bool:
-        value = self.coordinator.data[self.sensor["id"]]
-        if "on_if" in self.sensor:
-            return value == self.sensor["on_if"]
-        return value != self.sensor["off_if"]
+        value = getattr(self.coordinator.data, self._field)
+        if self._on_if is not None:
+            return value == self._on_if
+        return value != self._off_if
+
+
+class ProtexialElementBinarySensor(
+    CoordinatorEntity[ProtexialElementsCoordinator], BinarySensorEntity
+):
+    def __init__(self, entry_id, coordinator, element: Element, sensor: tuple) -> None:
+        super().__init__(coordinator)
+        field, name, device_class, self._property = sensor
+        self._code = element.code
+        self._element = element
+        self._success = coordinator.last_update_success
+        self._attr_unique_id = f"{entry_id}_element_{element.code}_{field}"
+        self._attr_name = name
+        self._attr_has_entity_name = True
+        self._attr_device_class = device_class
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, f"{entry_id}_{element.code}")},
+            name=" ".join(filter(None, [element.label, element.name])) or element.code,
+            manufacturer="Somfy",
+            model=element.label or None,
+            via_device=(DOMAIN, entry_id),
+        )
+
+    @property
+    def available(self) -> bool:
+        return super().available and self._element is not None
+
+    @property
+    def is_on(self) -> bool:
+        return getattr(self._element, self._property)
+
+    @property
+    def extra_state_attributes(self):
+        return {"code": self._code, "zone": self._element.zone}
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        # Only the elements that changed are written
+        element = (self.coordinator.data or {}).get(self._code)
+        success = self.coordinator.last_update_success
+        if element == self._element and success == self._success:
+            return
+        self._element = element
+        self._success = success
+        self.async_write_ha_state()
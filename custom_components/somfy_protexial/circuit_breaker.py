@@ -0,0 +1,90 @@
+from collections import deque
+import logging
+import time
+
+from .client_const import (
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_RECOVERY_TIMEOUT,
+    RETRY_BUDGET,
+    RETRY_BUDGET_WINDOW,
+    CircuitState,
+)
+from .somfy_exception import SomfyException
+
+_LOGGER: logging.Logger = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """Fail fast while the box doesn't answer instead of waiting for timeouts.
+
+    After a few consecutive transport failures the circuit opens and every
+    request fails immediately. Once the recovery timeout is over a single
+    probe request goes through (half-open): its success closes the circuit,
+    its failure opens it again. Retries after a re-login are also capped by
+    a budget per time window.
+    """
+
+    def __init__(
+        self,
+        failure_threshold=CIRCUIT_FAILURE_THRESHOLD,
+        recovery_timeout=CIRCUIT_RECOVERY_TIMEOUT,
+        retry_budget=RETRY_BUDGET,
+        retry_budget_window=RETRY_BUDGET_WINDOW,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.retry_budget = retry_budget
+        self.retry_budget_window = retry_budget_window
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+        self._retries = deque()
+
+    def before_request(self):
+        if self.state == CircuitState.OPEN:
+            remaining = self.opened_at + self.recovery_timeout - time.monotonic()
+            if remaining > 0:
+                raise SomfyException(
+                    f"Box unavailable, next attempt in {int(remaining) + 1}s"
+                )
+            _LOGGER.debug("Circuit half-open, probing the box")
+            self.state = CircuitState.HALF_OPEN
+        if self.state == CircuitState.HALF_OPEN:
+            if self._probing:
+                raise SomfyException("Box unavailable, waiting for the probe request")
+            self._probing = True
+
+    def record_success(self):
+        if self.state != CircuitState.CLOSED:
+            _LOGGER.info("Box is back, closing the circuit")
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self._probing = False
+
+    def record_failure(self):
+        self.failures += 1
+        self._probing = False
+        if (
+            self.state == CircuitState.HALF_OPEN
+            or self.failures >= self.failure_threshold
+        ):
+            if self.state != CircuitState.OPEN:
+                _LOGGER.warning(
+                    "Box unavailable after %s failures, opening the circuit",
+                    self.failures,
+                )
+            self.state = CircuitState.OPEN
+            self.opened_at = time.monotonic()
+
+    def release(self):
+        """Forget a request that was cancelled before it completed."""
+        self._probing = False
+
+    def consume_retry(self):
+        now = time.monotonic()
+        while self._retries and now - self._retries[0] > self.retry_budget_window:
+            self._retries.popleft()
+        if len(self._retries) >= self.retry_budget:
+            raise SomfyException("Retry budget exhausted")
+        self._retries.append(now)
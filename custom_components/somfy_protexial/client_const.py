@@ -0,0 +1,105 @@
+"""Constants of the box client, no Home Assistant import.
+
+The client modules only import these so they also run outside of Home
+Assistant, const.py re-exports them for the integration.
+"""
+
+from enum import Enum
+
+CHALLENGE_REGEX = r"[A-F]{1}[1-5]{1}"
+
+HTTP_TIMEOUT = 10
+HTTP_CONNECT_TIMEOUT = 5
+HTTP_READ_TIMEOUT = 8
+# The box web server only copes with very few sockets at once
+HTTP_CONNECTION_LIMIT = 2
+HTTP_KEEPALIVE_TIMEOUT = 30
+DNS_CACHE_TTL = 300
+
+# Concurrent requests while detecting the centrale type
+GUESS_CONCURRENCY = 2
+
+CIRCUIT_FAILURE_THRESHOLD = 3
+CIRCUIT_RECOVERY_TIMEOUT = 30
+# Re-login retries allowed per window
+RETRY_BUDGET = 5
+RETRY_BUDGET_WINDOW = 60
+
+# The box drops idle sessions after a few minutes, renew a bit before that
+SESSION_IDLE_TIMEOUT = 300
+SESSION_RENEW_MARGIN = 30
+# The box only has one user session, it is kept warm this long after the last
+# command then released so its web interface can be used. The first command
+# after that logs in again (configurable, 0 never keeps it warm)
+SESSION_KEEP_ALIVE_WINDOW = 600
+SESSION_MAX_RENEW_BACKOFF = 1800
+
+# Request metrics roll over this window, split in slots expiring one at a time
+METRICS_WINDOW = 3600
+METRICS_SLOTS = 12
+# Upper bounds in seconds of the latency histogram buckets
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2, 4, 8, 16)
+# Latest requests kept for the diagnostics download
+METRICS_SAMPLE_SIZE = 50
+
+# Delay during which a queued light or cover command can be replaced by a newer one
+COMMAND_COALESCE_WINDOW = 0.5
+
+# Headless fleet runner: polls in flight, +/- ratio of the interval, longest delay
+FLEET_CONCURRENCY = 64
+FLEET_JITTER = 0.1
+FLEET_MAX_BACKOFF = 900
+
+
+class SomfyError(str, Enum):
+    WRONG_CODE = "(0x0B00)"
+    MAX_LOGIN_ATTEMPS = "(0x0904)"
+    WRONG_CREDENTIALS = "(0x0812)"
+    SESSION_ALREADY_OPEN = "(0x0902)"
+    NOT_AUTHORIZED = "(0x0903)"
+    UNKNOWN_PARAMETER = "(0x1003)"
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CommandPriority(int, Enum):
+    ALARM = 0
+    DEVICE = 1
+
+
+class Zone(Enum):
+    NONE = 0
+    A = 1
+    B = 2
+    C = 4
+    ABC = 7
+
+
+class ApiType(str, Enum):
+    PROTEXIAL = "protexial"
+    PROTEXIOM = "protexiom"
+    PROTEXIAL_IO = "protexial_io"
+
+
+class Page(str, Enum):
+    LOGIN = "login"
+    LOGOUT = "logout"
+    PILOTAGE = "pilotage"
+    STATUS = "status"
+    ERROR = "error"
+    ELEMENTS = "elements"
+    CHALLENGE_CARD = "challenge_card"
+    VERSION = "version"
+    DEFAULT = "default"
+
+
+class Selector(str, Enum):
+    CONTENT_TYPE = "content_type"
+    LOGIN_CHALLENGE = "login_challenge"
+    ERROR_CODE = "error_code"
+    FOOTER = "footer"
+    CHALLENGE_CARD = "challenge_card"
@@ -0,0 +1,41 @@
+from aiohttp import ClientSession, ClientTimeout, DummyCookieJar, TCPConnector
+
+from .client_const import (
+    DNS_CACHE_TTL,
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_CONNECTION_LIMIT,
+    HTTP_KEEPALIVE_TIMEOUT,
+    HTTP_READ_TIMEOUT,
+    HTTP_TIMEOUT,
+)
+
+HTTP_CLIENT_TIMEOUT = ClientTimeout(
+    total=HTTP_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT, sock_read=HTTP_READ_TIMEOUT
+)
+
+
+def create_client_session(
+    limit=HTTP_CONNECTION_LIMIT,
+    limit_per_host=HTTP_CONNECTION_LIMIT,
+    trace_configs=None,
+) -> ClientSession:
+    """Create a session tuned for slow embedded web servers.
+
+    A single box by default, a fleet shares one session with a higher limit.
+    The per host limit protects each box and stays at HTTP_CONNECTION_LIMIT
+    unless several boxes are reached through the same host (a proxy).
+    """
+    connector = TCPConnector(
+        limit=limit,
+        limit_per_host=limit_per_host,
+        keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+        use_dns_cache=True,
+        ttl_dns_cache=DNS_CACHE_TTL,
+    )
+    # The session cookie is handled by SessionManager, don't parse it twice
+    return ClientSession(
+        connector=connector,
+        timeout=HTTP_CLIENT_TIMEOUT,
+        cookie_jar=DummyCookieJar(),
+        trace_configs=trace_configs,
+    )
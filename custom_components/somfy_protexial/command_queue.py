@@ -0,0 +1,115 @@
+import asyncio
+import itertools
+import logging
+import time
+
+from .client_const import COMMAND_COALESCE_WINDOW, CommandPriority
+
+_LOGGER: logging.Logger = logging.getLogger(__name__)
+
+
+class _Command:
+    def __init__(self, action, priority, sequence, key) -> None:
+        self.action = action
+        self.priority = priority
+        self.sequence = sequence
+        self.key = key
+        self.enqueued_at = time.monotonic()
+        self.future = asyncio.get_running_loop().create_future()
+        self.superseded = False
+
+    def __lt__(self, other):
+        return (self.priority, self.sequence) < (other.priority, other.sequence)
+
+
+def _forward_result(source: asyncio.Future, target: asyncio.Future):
+    if target.done():
+        return
+    if source.cancelled():
+        target.cancel()
+    elif source.exception() is not None:
+        target.set_exception(source.exception())
+    else:
+        target.set_result(source.result())
+
+
+class CommandQueue:
+    """Run pilotage commands one at a time, by priority then submission order.
+
+    Commands sharing a coalescing key replace each other while they are still
+    queued: within the coalescing window only the last one is sent, and the
+    callers of the replaced commands get its result.
+    """
+
+    def __init__(self, coalesce_window=COMMAND_COALESCE_WINDOW) -> None:
+        self.coalesce_window = coalesce_window
+        self._queue = asyncio.PriorityQueue()
+        self._pending = {}
+        self._sequence = itertools.count()
+        self._submitted = asyncio.Event()
+        self._worker = None
+
+    async def submit(self, action, priority=CommandPriority.DEVICE, key=None):
+        command = _Command(action, priority, next(self._sequence), key)
+        if key is not None:
+            previous = self._pending.get(key)
+            if previous is not None:
+                _LOGGER.debug("Coalescing queued '%s' command", key)
+                previous.superseded = True
+                command.future.add_done_callback(
+                    lambda future: _forward_result(future, previous.future)
+                )
+            self._pending[key] = command
+        self._queue.put_nowait(command)
+        self._submitted.set()
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+        # Other callers may be chained to this command, don't cancel it with us
+        return await asyncio.shield(command.future)
+
+    async def stop(self):
+        worker = self._worker
+        self._worker = None
+        if worker is not None:
+            worker.cancel()
+            try:
+                await worker
+            except asyncio.CancelledError:
+                pass
+        while not self._queue.empty():
+            command = self._queue.get_nowait()
+            if not command.future.done():
+                command.future.cancel()
+        self._pending.clear()
+
+    async def _run(self):
+        while True:
+            command = await self._queue.get()
+            if command.superseded:
+                continue
+            delay = 0
+            if command.key is not None:
+                delay = command.enqueued_at + self.coalesce_window - time.monotonic()
+            if delay > 0:
+                # Give a follow-up command a chance to replace this one, but
+                # let anything submitted meanwhile with a higher priority go first
+                self._queue.put_nowait(command)
+                self._submitted.clear()
+                try:
+                    await asyncio.wait_for(self._submitted.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            if self._pending.get(command.key) is command:
+                del self._pending[command.key]
+            try:
+                result = await command.action()
+            except asyncio.CancelledError:
+                command.future.cancel()
+                raise
+            except Exception as exception:  # pylint: disable=broad-except
+                if not command.future.done():
+                    command.future.set_exception(exception)
+            else:
+                if not command.future.done():
+                    command.future.set_result(result)
@@ -15,6 +15,7 @@ from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers import aiohttp_client, config_validation as cv
 from homeassistant.helpers.selector import (
+    BooleanSelector,
     NumberSelector,
     NumberSelectorConfig,
     NumberSelectorMode,
@@ -33,9 +34,16 @@ from .const import (
     CONF_ARM_CODE,
     CONF_CODE,
     CONF_CODES,
+    CONF_FINGERPRINT,
     CONF_HOME_ZONES,
+    CONF_KEEP_ALIVE_WINDOW,
+    CONF_MIN_SCAN_INTERVAL,
     CONF_NIGHT_ZONES,
+    CONF_WATCH_EVENTS,
+    DEFAULT_MIN_SCAN_INTERVAL,
+    DEFAULT_WATCH_EVENTS,
     DOMAIN,
+    SESSION_KEEP_ALIVE_WINDOW,
     Zone,
 )
 from .protexial import SomfyProtexial
@@ -45,7 +53,7 @@ _LOGGER = logging.getLogger(__name__)
 
 class ProtexialConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     VERSION = 1
-    MINOR_VERSION = 3
+    MINOR_VERSION = 5
 
     def __init__(self) -> None:
         super().__init__()
@@ -57,13 +65,12 @@ class ProtexialConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         self.password = None
 
     async def async_step_user(self, user_input):
-        if self._async_current_entries():
-            return self.async_abort(reason="single_instance_allowed")
-
         errors = {}
         if user_input is not None:
             parts = urlparse(user_input[CONF_URL].strip())
             self.url = f"{parts.scheme}://{parts.netloc}"
+            await self.async_set_unique_id(self.url)
+            self._abort_if_unique_id_configured()
             session = aiohttp_client.async_create_clientsession(self.hass)
             self.protexial = SomfyProtexial(session, self.url)
             try:
@@ -130,6 +137,8 @@ class ProtexialConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 and user_input[CONF_NIGHT_ZONES] == user_input[CONF_HOME_ZONES]
             ):
                 errors["base"] = "same_zones"
+            elif user_input[CONF_MIN_SCAN_INTERVAL] > user_input[CONF_SCAN_INTERVAL]:
+                errors["base"] = "scan_intervals"
             else:
                 night_zones = int(user_input[CONF_NIGHT_ZONES])
                 home_zones = int(user_input[CONF_HOME_ZONES])
@@ -144,8 +153,12 @@ class ProtexialConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                         CONF_NIGHT_ZONES: night_zones,
                         CONF_HOME_ZONES: home_zones,
                         CONF_ARM_CODE: arm_code,
+                        CONF_MIN_SCAN_INTERVAL: user_input[CONF_MIN_SCAN_INTERVAL],
                         CONF_SCAN_INTERVAL: user_input[CONF_SCAN_INTERVAL],
+                        CONF_WATCH_EVENTS: user_input[CONF_WATCH_EVENTS],
+                        CONF_KEEP_ALIVE_WINDOW: user_input[CONF_KEEP_ALIVE_WINDOW],
                         ATTR_SW_VERSION: self.version,
+                        CONF_FINGERPRINT: self.protexial.fingerprint,
                     },
                 )
 
@@ -177,11 +190,28 @@ class ProtexialConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     vol.Optional(CONF_ARM_CODE): TextSelector(
                         TextSelectorConfig(type=TextSelectorType.PASSWORD)
                     ),
+                    vol.Required(
+                        CONF_MIN_SCAN_INTERVAL, default=DEFAULT_MIN_SCAN_INTERVAL
+                    ): NumberSelector(
+                        NumberSelectorConfig(
+                            mode=NumberSelectorMode.BOX, min=5, max=3600, step=1
+                        )
+                    ),
                     vol.Required(CONF_SCAN_INTERVAL, default=60): NumberSelector(
                         NumberSelectorConfig(
                             mode=NumberSelectorMode.BOX, min=15, max=3600, step=1
                         )
                     ),
+                    vol.Required(
+                        CONF_WATCH_EVENTS, default=DEFAULT_WATCH_EVENTS
+                    ): BooleanSelector(),
+                    vol.Required(
+                        CONF_KEEP_ALIVE_WINDOW, default=SESSION_KEEP_ALIVE_WINDOW
+                    ): NumberSelector(
+                        NumberSelectorConfig(
+                            mode=NumberSelectorMode.BOX, min=0, max=86400, step=1
+                        )
+                    ),
                 }
             ),
         )
@@ -216,20 +246,21 @@ class ProtexialOptionsFlowHandler(config_entries.OptionsFlow):
                 and user_input[CONF_NIGHT_ZONES] == user_input[CONF_HOME_ZONES]
             ):
                 errors["base"] = "same_zones"
+            elif user_input[CONF_MIN_SCAN_INTERVAL] > user_input[CONF_SCAN_INTERVAL]:
+                errors["base"] = "scan_intervals"
             else:
                 night_zones = int(user_input[CONF_NIGHT_ZONES])
                 home_zones = int(user_input[CONF_HOME_ZONES])
+                # Keep the rest, the fingerprint saves a detection on reload
                 newData = {
-                    CONF_URL: self.config_entry.data[CONF_URL],
-                    CONF_API_TYPE: self.config_entry.data[CONF_API_TYPE],
-                    CONF_USERNAME: self.config_entry.data[CONF_USERNAME],
-                    CONF_PASSWORD: self.config_entry.data[CONF_PASSWORD],
-                    CONF_CODES: self.config_entry.data[CONF_CODES],
+                    **self.config_entry.data,
                     CONF_NIGHT_ZONES: night_zones,
                     CONF_HOME_ZONES: home_zones,
                     CONF_ARM_CODE: arm_code,
+                    CONF_MIN_SCAN_INTERVAL: user_input[CONF_MIN_SCAN_INTERVAL],
                     CONF_SCAN_INTERVAL: user_input[CONF_SCAN_INTERVAL],
-                    ATTR_SW_VERSION: self.config_entry.data[ATTR_SW_VERSION],
+                    CONF_WATCH_EVENTS: user_input[CONF_WATCH_EVENTS],
+                    CONF_KEEP_ALIVE_WINDOW: user_input[CONF_KEEP_ALIVE_WINDOW],
                 }
                 self.hass.config_entries.async_update_entry(
                     self.config_entry, data=newData, options=self.config_entry.options
@@ -267,6 +298,14 @@ class ProtexialOptionsFlowHandler(config_entries.OptionsFlow):
                     vol.Optional(CONF_ARM_CODE): TextSelector(
                         TextSelectorConfig(type=TextSelectorType.PASSWORD)
                     ),
+                    vol.Required(
+                        CONF_MIN_SCAN_INTERVAL,
+                        default=self.config_entry.data[CONF_MIN_SCAN_INTERVAL],
+                    ): NumberSelector(
+                        NumberSelectorConfig(
+                            mode=NumberSelectorMode.BOX, min=5, max=3600, step=1
+                        )
+                    ),
                     vol.Required(
                         CONF_SCAN_INTERVAL,
                         default=self.config_entry.data[CONF_SCAN_INTERVAL],
@@ -275,6 +314,22 @@ class ProtexialOptionsFlowHandler(config_entries.OptionsFlow):
                             mode=NumberSelectorMode.BOX, min=15, max=3600, step=1
                         )
                     ),
+                    vol.Required(
+                        CONF_WATCH_EVENTS,
+                        default=self.config_entry.data.get(
+                            CONF_WATCH_EVENTS, DEFAULT_WATCH_EVENTS
+                        ),
+                    ): BooleanSelector(),
+                    vol.Required(
+                        CONF_KEEP_ALIVE_WINDOW,
+                        default=self.config_entry.data.get(
+                            CONF_KEEP_ALIVE_WINDOW, SESSION_KEEP_ALIVE_WINDOW
+                        ),
+                    ): NumberSelector(
+                        NumberSelectorConfig(
+                            mode=NumberSelectorMode.BOX, min=0, max=86400, step=1
+                        )
+                    ),
                 }
             ),
         )
@@ -1,8 +1,9 @@
-from enum import Enum
-
 from homeassistant.components.binary_sensor import BinarySensorDeviceClass
 from homeassistant.const import EntityCategory
 
+# The client constants, for the integration modules importing them from here
+from .client_const import *  # noqa: F401,F403
+
 DOMAIN = "somfy_protexial"
 
 CONF_API_TYPE = "api_type"
@@ -12,63 +13,44 @@ CONF_MODES = "modes"
 CONF_ARM_CODE = "arm_code"
 CONF_NIGHT_ZONES = "night_zones"
 CONF_HOME_ZONES = "home_zones"
+CONF_MIN_SCAN_INTERVAL = "min_scan_interval"
+CONF_FINGERPRINT = "fingerprint"
+CONF_WATCH_EVENTS = "watch_events"
+CONF_KEEP_ALIVE_WINDOW = "keep_alive_window"
 
 API = "api"
 COORDINATOR = "coordinator"
 DEVICE_INFO = "device_info"
-
-CHALLENGE_REGEX = r"[A-F]{1}[1-5]{1}"
-
-
-HTTP_TIMEOUT = 10
-
-
-class SomfyError(str, Enum):
-    WRONG_CODE = "(0x0B00)"
-    MAX_LOGIN_ATTEMPS = "(0x0904)"
-    WRONG_CREDENTIALS = "(0x0812)"
-    SESSION_ALREADY_OPEN = "(0x0902)"
-    NOT_AUTHORIZED = "(0x0903)"
-    UNKNOWN_PARAMETER = "(0x1003)"
-
-
-class Zone(Enum):
-    NONE = 0
-    A = 1
-    B = 2
-    C = 4
-    ABC = 7
-
+WATCHER = "watcher"
+POLL_SPREADER = "poll_spreader"
+ELEMENTS_COORDINATOR = "elements_coordinator"
+
+# Delay before polling the box to confirm the outcome of a command
+CONFIRMATION_REFRESH_DELAY = 3
+
+DEFAULT_MIN_SCAN_INTERVAL = 10
+# Poll at the minimum interval for a while after a command or one of these changes
+ACTIVITY_FIELDS = frozenset(["alarm", "door"])
+ACTIVITY_WINDOW = 300
+FAILURE_BACKOFF_FACTOR = 4
+
+# The element list is a heavy page, only read it every few hours or when one of
+# the global defect flags changes
+ELEMENTS_SCAN_INTERVAL = 4 * 3600
+ELEMENTS_REFRESH_FIELDS = frozenset(["battery", "radio", "box"])
+
+# The watcher reads status.xml this often to fire events while the box is active
+# (see AdaptiveScheduler.watch_interval), backing off on errors
+DEFAULT_WATCH_EVENTS = True
+WATCH_INTERVAL = 1
+WATCH_ERROR_DELAY = 30
+EVENT_ALARM_TRIGGERED = f"{DOMAIN}_alarm_triggered"
+EVENT_DOOR_CHANGED = f"{DOMAIN}_door_changed"
+EVENT_ZONE_CHANGED = f"{DOMAIN}_zone_changed"
 
 ALL_ZONES = ["0", "1", "2", "4", "3", "6", "5"]
 
 
-class ApiType(str, Enum):
-    PROTEXIAL = "protexial"
-    PROTEXIOM = "protexiom"
-    PROTEXIAL_IO = "protexial_io"
-
-
-class Page(str, Enum):
-    LOGIN = "login"
-    LOGOUT = "logout"
-    PILOTAGE = "pilotage"
-    STATUS = "status"
-    ERROR = "error"
-    ELEMENTS = "elements"
-    CHALLENGE_CARD = "challenge_card"
-    VERSION = "version"
-    DEFAULT = "default"
-
-
-class Selector(str, Enum):
-    CONTENT_TYPE = "content_type"
-    LOGIN_CHALLENGE = "login_challenge"
-    ERROR_CODE = "error_code"
-    FOOTER = "footer"
-    CHALLENGE_CARD = "challenge_card"
-
-
 BINARY_SENSORS = [
     {
         "id": "battery",
@@ -0,0 +1,177 @@
+from datetime import timedelta
+import logging
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+
+from .const import (
+    CONFIRMATION_REFRESH_DELAY,
+    ELEMENTS_REFRESH_FIELDS,
+    ELEMENTS_SCAN_INTERVAL,
+)
+from .elements import Element
+from .protexial import SomfyProtexial
+from .scheduler import AdaptiveScheduler, PollSpreader
+from .status import Status
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ProtexialCoordinator(DataUpdateCoordinator[Status]):
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        protexial: SomfyProtexial,
+        scheduler: AdaptiveScheduler,
+        spreader: PollSpreader,
+    ) -> None:
+        super().__init__(
+            hass,
+            _LOGGER,
+            config_entry=entry,
+            name=f"Somfy Protexial status update ({entry.title})",
+            update_interval=timedelta(seconds=scheduler.interval),
+        )
+        self.protexial = protexial
+        self.scheduler = scheduler
+        self.spreader = spreader
+        self.changed_fields = frozenset()
+        self._notified_data = None
+        self._notified_success = None
+        # Status field -> {listener key: callback}, the key being the one used
+        # in self._listeners so a removed listener can be dropped everywhere
+        self._field_listeners: dict[str, dict] = {}
+        self._confirmation_refresh = Debouncer(
+            hass,
+            _LOGGER,
+            cooldown=CONFIRMATION_REFRESH_DELAY,
+            immediate=False,
+            function=self.async_refresh,
+        )
+
+    async def _async_update_data(self) -> Status:
+        try:
+            status = await self.protexial.get_status()
+            _LOGGER.debug(status)
+        except Exception as err:
+            self.__set_interval(self.scheduler.on_failure())
+            raise UpdateFailed(f"Error communicating with API: {err}")
+        # Picked before returning so the next refresh is scheduled with it
+        interval = self.scheduler.on_success(status, status.diff(self.data).keys())
+        self.__set_interval(interval)
+        return status
+
+    def __set_interval(self, interval):
+        delay = self.spreader.delay(self.config_entry.entry_id, interval)
+        self.update_interval = timedelta(seconds=delay)
+
+    async def async_set_expected_data(self, status: Status) -> None:
+        """Publish the state a command should lead to, then confirm it."""
+        self.scheduler.note_activity()
+        self.__set_interval(self.scheduler.interval)
+        self.async_set_updated_data(status)
+        await self._confirmation_refresh.async_call()
+
+    @callback
+    def async_set_watched_data(self, status: Status) -> None:
+        """Publish a change the watcher saw between two polls."""
+        interval = self.scheduler.on_success(status, status.diff(self.data).keys())
+        self.__set_interval(interval)
+        self.async_set_updated_data(status)
+
+    @callback
+    def async_add_listener(self, update_callback, context=None):
+        """Listen for updates, only for changes of the fields in context if any."""
+        remove_listener = super().async_add_listener(update_callback, context)
+        status_fields = context or ()
+        for field in status_fields:
+            self._field_listeners.setdefault(field, {})[
+                remove_listener
+            ] = update_callback
+
+        @callback
+        def remove_field_listener() -> None:
+            for field in status_fields:
+                self._field_listeners[field].pop(remove_listener, None)
+            remove_listener()
+
+        return remove_field_listener
+
+    @callback
+    def async_update_listeners(self) -> None:
+        previous_data, self._notified_data = self._notified_data, self.data
+        previous_success, self._notified_success = (
+            self._notified_success,
+            self.last_update_success,
+        )
+        if self.data is None or previous_success != self.last_update_success:
+            # Availability changed, everybody has to know
+            self.changed_fields = frozenset()
+            super().async_update_listeners()
+            return
+
+        self.changed_fields = frozenset(self.data.diff(previous_data))
+        listeners = {
+            key: update_callback
+            for key, (update_callback, context) in self._listeners.items()
+            if not context
+        }
+        for field in self.changed_fields:
+            listeners.update(self._field_listeners.get(field, {}))
+        for update_callback in list(listeners.values()):
+            update_callback()
+
+    async def async_shutdown(self) -> None:
+        self._confirmation_refresh.async_shutdown()
+        await super().async_shutdown()
+
+
+class ProtexialElementsCoordinator(DataUpdateCoordinator[dict[str, Element]]):
+    """Slow tier reading the element list, battery and tamper per detector.
+
+    Refreshed every ELEMENTS_SCAN_INTERVAL, or soon after one of the global
+    defect flags of status.xml changes.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        status_coordinator: ProtexialCoordinator,
+    ) -> None:
+        super().__init__(
+            hass,
+            _LOGGER,
+            config_entry=entry,
+            name=f"Somfy Protexial elements update ({entry.title})",
+            update_interval=timedelta(seconds=ELEMENTS_SCAN_INTERVAL),
+        )
+        self.protexial = status_coordinator.protexial
+        self.status_coordinator = status_coordinator
+        self._remove_status_listener = status_coordinator.async_add_listener(
+            self.__on_defect_change, ELEMENTS_REFRESH_FIELDS
+        )
+
+    @callback
+    def __on_defect_change(self) -> None:
+        # Availability changes notify every listener, only follow flag changes
+        changed_fields = self.status_coordinator.changed_fields
+        if not ELEMENTS_REFRESH_FIELDS.isdisjoint(changed_fields):
+            self.hass.async_create_task(self.async_request_refresh())
+
+    async def _async_update_data(self) -> dict[str, Element]:
+        try:
+            return await self.protexial.get_elements()
+        except Exception as err:
+            raise UpdateFailed(f"Error communicating with API: {err}")
+
+    async def async_shutdown(self) -> None:
+        # Also run by the config entry once unloaded, after the explicit call
+        # made before logging out
+        if self._remove_status_listener is not None:
+            self._remove_status_listener()
+            self._remove_status_listener = None
+        await super().async_shutdown()
@@ -25,14 +25,14 @@ async def async_setup_entry(
     api = hass.data[DOMAIN][config_entry.entry_id][API]
     device_info = hass.data[DOMAIN][config_entry.entry_id][DEVICE_INFO]
     lights = []
-    lights.append(ProtexialCover(device_info, api))
+    lights.append(ProtexialCover(config_entry.entry_id, device_info, api))
     async_add_entities(lights)
 
 
 class ProtexialCover(CoverEntity):
-    def __init__(self, device_info, api: SomfyProtexial) -> None:
+    def __init__(self, entry_id, device_info, api: SomfyProtexial) -> None:
         super().__init__()
-        self._attr_unique_id = f"{DOMAIN}_control_cover"
+        self._attr_unique_id = f"{entry_id}_control_cover"
         self._attr_device_info = device_info
         self.api = api
 
@@ -0,0 +1,65 @@
+from dataclasses import asdict
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_PASSWORD, CONF_URL, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    API,
+    CONF_ARM_CODE,
+    CONF_CODES,
+    CONF_FINGERPRINT,
+    COORDINATOR,
+    DOMAIN,
+    ELEMENTS_COORDINATOR,
+)
+
+TO_REDACT = {CONF_PASSWORD, CONF_CODES, CONF_ARM_CODE, CONF_USERNAME, CONF_URL}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict:
+    data = hass.data[DOMAIN][entry.entry_id]
+    protexial = data[API]
+    coordinator = data[COORDINATOR]
+    elements_coordinator = data[ELEMENTS_COORDINATOR]
+    scheduler = coordinator.scheduler
+    session_manager = protexial.session_manager
+    circuit_breaker = protexial.circuit_breaker
+
+    return {
+        "entry": {
+            "version": f"{entry.version}.{entry.minor_version}",
+            "data": async_redact_data(entry.data, TO_REDACT),
+            "options": async_redact_data(entry.options, TO_REDACT),
+        },
+        "box": {
+            "api_type": protexial.api_type,
+            "firmware": protexial.firmware,
+            "fingerprint": entry.data.get(CONF_FINGERPRINT),
+        },
+        "scheduler": {
+            "interval": scheduler.interval,
+            "floor": scheduler.floor,
+            "ceiling": scheduler.ceiling,
+            "active": scheduler.is_active(),
+            "update_interval": coordinator.update_interval.total_seconds(),
+            "last_update_success": coordinator.last_update_success,
+        },
+        "session": {
+            "open": session_manager.cookie is not None,
+            "age": session_manager.age,
+            "idle_time": session_manager.idle_time,
+            "idle_timeout": session_manager.idle_timeout,
+            "generation": session_manager.generation,
+        },
+        "circuit_breaker": {
+            "state": circuit_breaker.state.value,
+            "failures": circuit_breaker.failures,
+        },
+        "metrics": protexial.metrics.as_dict(),
+        "status": None if coordinator.data is None else asdict(coordinator.data),
+        "elements": len(elements_coordinator.data or {}),
+    }
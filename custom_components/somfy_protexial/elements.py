@@ -0,0 +1,74 @@
+from dataclasses import dataclass
+from html import unescape
+import re
+
+# u_plistelmt.htm declares one javascript array per element property, the
+# elements being at the same index in every array
+_ARRAY_REGEX = re.compile(r"var\s+(\w+)\s*=\s*new\s+Array\s*\((.*?)\)\s*;", re.DOTALL)
+_STRING_REGEX = re.compile(r"\"([^\"]*)\"|'([^']*)'")
+
+# javascript array -> Element field
+_ELEMENT_ARRAYS = {
+    "elt_code": "code",
+    "item_label": "label",
+    "elt_name": "name",
+    "elt_zone": "zone",
+    "elt_pile": "battery",
+    "elt_as": "tamper",
+    "elt_onde": "radio",
+    "elt_porte": "door",
+    "elt_maison": "house",
+}
+
+
+@dataclass(frozen=True, slots=True)
+class Element:
+    code: str
+    label: str = ""
+    name: str = ""
+    zone: str = ""
+    battery: str = ""
+    tamper: str = ""
+    radio: str = ""
+    door: str = ""
+    house: str = ""
+
+    @property
+    def battery_low(self) -> bool:
+        return is_defect(self.battery)
+
+    @property
+    def tampered(self) -> bool:
+        return is_defect(self.tamper)
+
+    @property
+    def radio_lost(self) -> bool:
+        return is_defect(self.radio)
+
+
+def is_defect(value) -> bool:
+    # Flags are css classes like "itembattok" / "itembattnok"
+    return value.endswith("nok")
+
+
+def parse_elements(content) -> dict[str, Element]:
+    """Elements of the box by code, from the u_plistelmt.htm page."""
+    arrays = {}
+    for name, values in _ARRAY_REGEX.findall(content):
+        field = _ELEMENT_ARRAYS.get(name)
+        if field is not None:
+            arrays[field] = [
+                unescape(double or single).strip()
+                for double, single in _STRING_REGEX.findall(values)
+            ]
+    elements = {}
+    for index, code in enumerate(arrays.pop("code", [])):
+        if not code:
+            continue
+        values = {
+            field: values[index]
+            for field, values in arrays.items()
+            if index < len(values)
+        }
+        elements[code] = Element(code, **values)
+    return elements
@@ -0,0 +1,15 @@
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .coordinator import ProtexialCoordinator
+
+
+class ProtexialEntity(CoordinatorEntity[ProtexialCoordinator]):
+    # Status fields the entity state is computed from, the coordinator only
+    # notifies the entity when one of them changes
+    status_fields: frozenset[str] = frozenset()
+
+    def __init__(self, coordinator: ProtexialCoordinator, status_fields=None) -> None:
+        if status_fields is not None:
+            self.status_fields = frozenset(status_fields)
+        # Without status fields the entity is notified of every update
+        super().__init__(coordinator, context=self.status_fields or None)
@@ -0,0 +1,173 @@
+"""Poll a fleet of boxes from a single process, outside of Home Assistant."""
+
+import asyncio
+from dataclasses import dataclass
+import heapq
+import logging
+import random
+import time
+
+from .client_const import (
+    FLEET_CONCURRENCY,
+    FLEET_JITTER,
+    FLEET_MAX_BACKOFF,
+    HTTP_CONNECTION_LIMIT,
+)
+from .client_session import create_client_session
+from .protexial import SomfyProtexial
+from .status import Status
+
+_LOGGER: logging.Logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class StatusChange:
+    box: str
+    status: Status
+    changes: dict
+
+
+class _Box:
+    def __init__(self, key, protexial: SomfyProtexial) -> None:
+        self.key = key
+        self.protexial = protexial
+        self.status = None
+        self.failures = 0
+
+
+class Fleet:
+    """Poll the status of many boxes and yield what changed.
+
+    Boxes are polled every interval with some jitter, at most `concurrency`
+    at once, and back off exponentially while they fail. Status only needs
+    the box URL and model, no login is made. Each host gets at most
+    `limit_per_host` connections, raise it when the boxes sit behind a
+    shared proxy.
+
+    The client modules don't import Home Assistant, only the integration's
+    __init__ does. Without the homeassistant package, load the directory as
+    a package of its own rather than through custom_components:
+
+        pkg = types.ModuleType("somfy_protexial")
+        pkg.__path__ = ["custom_components/somfy_protexial"]
+        sys.modules["somfy_protexial"] = pkg
+        from somfy_protexial.fleet import Fleet
+
+        async with Fleet({"site1": {"url": ..., "api_type": ...}}) as fleet:
+            async for change in fleet.changes():
+                ...
+    """
+
+    def __init__(
+        self,
+        boxes: dict,
+        interval=60,
+        concurrency=FLEET_CONCURRENCY,
+        jitter=FLEET_JITTER,
+        max_backoff=FLEET_MAX_BACKOFF,
+        limit_per_host=HTTP_CONNECTION_LIMIT,
+    ) -> None:
+        self.interval = interval
+        self.concurrency = concurrency
+        self.jitter = jitter
+        self.max_backoff = max_backoff
+        self.limit_per_host = limit_per_host
+        self.polls = 0
+        self._configs = boxes
+        self._boxes = {}
+        self._session = None
+        self._changes = asyncio.Queue(maxsize=concurrency)
+        self._schedule = []
+        self._rescheduled = asyncio.Event()
+        self._task = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+
+    async def start(self):
+        self._session = create_client_session(
+            limit=self.concurrency, limit_per_host=self.limit_per_host
+        )
+        for key, config in self._configs.items():
+            protexial = SomfyProtexial(self._session, **config)
+            self._boxes[key] = _Box(key, protexial)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def changes(self):
+        """Yield a StatusChange for the first status of a box then for every change."""
+        while True:
+            yield await self._changes.get()
+
+    def failing(self):
+        return [box.key for box in self._boxes.values() if box.failures > 0]
+
+    async def _run(self):
+        # Boxes start spread over the first interval, then keep their own pace
+        now = time.monotonic()
+        schedule = self._schedule
+        schedule.extend(
+            (now + random.uniform(0, self.interval), key) for key in self._boxes
+        )
+        heapq.heapify(schedule)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        polls = set()
+        try:
+            while True:
+                delay = schedule[0][0] - time.monotonic() if schedule else None
+                if delay is None or delay > 0:
+                    # Woken up early when a box is rescheduled before the next one
+                    self._rescheduled.clear()
+                    try:
+                        await asyncio.wait_for(self._rescheduled.wait(), delay)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+                _, key = heapq.heappop(schedule)
+                await semaphore.acquire()
+                poll = asyncio.create_task(self._poll(self._boxes[key]))
+                polls.add(poll)
+                poll.add_done_callback(polls.discard)
+                poll.add_done_callback(lambda _: semaphore.release())
+        finally:
+            for poll in polls:
+                poll.cancel()
+            await asyncio.gather(*polls, return_exceptions=True)
+
+    async def _poll(self, box: _Box):
+        try:
+            if box.protexial.api_type is None:
+                await box.protexial.guess_and_set_api_type()
+            status = await box.protexial.get_status()
+        except Exception as exception:
+            box.failures += 1
+            _LOGGER.debug(
+                "Box %s failed %s times: %s", box.key, box.failures, exception
+            )
+        else:
+            box.failures = 0
+            changes = status.diff(box.status)
+            box.status = status
+            if changes:
+                await self._changes.put(StatusChange(box.key, status, changes))
+        finally:
+            self.polls += 1
+        delay = min(self.max_backoff, self.interval * 2**box.failures)
+        delay *= random.uniform(1 - self.jitter, 1 + self.jitter)
+        heapq.heappush(self._schedule, (time.monotonic() + delay, box.key))
+        self._rescheduled.set()
@@ -1,4 +1,4 @@
-from .const import Zone
+from .client_const import Zone
 
 
 def int_to_zones(int_zones: int) -> list[Zone]:
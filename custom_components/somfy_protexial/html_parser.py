@@ -0,0 +1,31 @@
+"""HTML parsing, loaded on first use.
+
+Polling only reads status.xml, pages needing pyquery and lxml (login
+challenge, error pages, version footer, challenge card) are rare so their
+import cost is only paid when one of them is parsed.
+"""
+
+import html
+
+
+def parse_html(content):
+    from pyquery import PyQuery
+
+    return PyQuery(content)
+
+
+def extract_text(content, selector, pattern=None):
+    """Text of the elements matching the CSS selector.
+
+    The model's precompiled pattern is tried first, it captures the text of
+    a plain element in one scan. Only when it doesn't match is the page
+    parsed into a DOM.
+    """
+    if pattern is not None:
+        match = pattern.search(content)
+        if match is not None:
+            text = match.group(1)
+            if "&" in text:
+                text = html.unescape(text)
+            return " ".join(text.split())
+    return parse_html(content)(selector).text()
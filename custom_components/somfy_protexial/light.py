@@ -21,15 +21,15 @@ async def async_setup_entry(
     api = hass.data[DOMAIN][config_entry.entry_id][API]
     device_info = hass.data[DOMAIN][config_entry.entry_id][DEVICE_INFO]
     lights = []
-    lights.append(ProtexialLight(device_info, api))
+    lights.append(ProtexialLight(config_entry.entry_id, device_info, api))
     async_add_entities(lights)
 
 
 class ProtexialLight(LightEntity):
-    def __init__(self, device_info, api: SomfyProtexial) -> None:
+    def __init__(self, entry_id, device_info, api: SomfyProtexial) -> None:
         super().__init__()
         self.api = api
-        self._attr_unique_id = f"{DOMAIN}_control_light"
+        self._attr_unique_id = f"{entry_id}_control_light"
         self._attr_device_info = device_info
         self._changed_by = None
         self._state = False
@@ -0,0 +1,225 @@
+from bisect import bisect_left
+from collections import deque
+from dataclasses import asdict, dataclass
+import logging
+import time
+
+from aiohttp import TraceConfig
+
+from .client_const import (
+    LATENCY_BUCKETS,
+    METRICS_SAMPLE_SIZE,
+    METRICS_SLOTS,
+    METRICS_WINDOW,
+    Page,
+)
+
+_LOGGER: logging.Logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class RequestTiming:
+    """Timings of one call to the box, in seconds.
+
+    dns, connect and ttfb are only known when the session traces requests
+    (see request_trace_config), dns and connect stay None for a reused
+    connection and connect includes dns.
+    """
+
+    page: Page
+    method: str
+    started: float
+    status: int | None = None
+    bytes: int = 0
+    dns: float | None = None
+    connect: float | None = None
+    ttfb: float | None = None
+    total: float | None = None
+    timed_out: bool = False
+
+    def summary(self, now=None) -> dict:
+        """Only what the box was asked and how it answered, no header or payload."""
+        if now is None:
+            now = time.monotonic()
+        summary = asdict(self)
+        summary["page"] = self.page.value
+        summary["age"] = round(now - summary.pop("started"), 1)
+        for name in ("dns", "connect", "ttfb", "total"):
+            if summary[name] is not None:
+                summary[name] = round(summary[name], 4)
+        return summary
+
+
+class RollingHistogram:
+    """Counts of values per bucket over a sliding time window.
+
+    The window is split in slots which expire one at a time, recording a
+    value is a bisect and an increment.
+    """
+
+    def __init__(
+        self, bounds=LATENCY_BUCKETS, window=METRICS_WINDOW, slots=METRICS_SLOTS
+    ) -> None:
+        self.bounds = tuple(bounds)
+        self.slot_duration = window / slots
+        self._slots = deque(maxlen=slots)
+
+    def record(self, value, now=None):
+        index = self.__slot_index(now)
+        if not self._slots or self._slots[-1][0] != index:
+            self._slots.append((index, [0] * (len(self.bounds) + 1)))
+        self._slots[-1][1][bisect_left(self.bounds, value)] += 1
+
+    def counts(self, now=None) -> list[int]:
+        oldest = self.__slot_index(now) - self._slots.maxlen
+        counts = [0] * (len(self.bounds) + 1)
+        for index, slot in self._slots:
+            if index > oldest:
+                counts = [total + count for total, count in zip(counts, slot)]
+        return counts
+
+    def count(self, now=None) -> int:
+        return sum(self.counts(now))
+
+    def percentile(self, percent, now=None):
+        """Upper bound interpolated within the bucket holding the percentile."""
+        counts = self.counts(now)
+        rank = sum(counts) * percent / 100
+        if rank == 0:
+            return None
+        seen = 0
+        for bucket, count in enumerate(counts):
+            if count and seen + count >= rank:
+                if bucket == len(self.bounds):
+                    # Beyond the last bound, nothing better to report
+                    return self.bounds[-1]
+                low = self.bounds[bucket - 1] if bucket else 0
+                return low + (self.bounds[bucket] - low) * (rank - seen) / count
+            seen += count
+        return None
+
+    def __slot_index(self, now):
+        if now is None:
+            now = time.monotonic()
+        return int(now // self.slot_duration)
+
+
+class RollingCounter(RollingHistogram):
+    """Number of events over a sliding time window."""
+
+    def __init__(self, window=METRICS_WINDOW, slots=METRICS_SLOTS) -> None:
+        super().__init__((), window, slots)
+
+    def increment(self, now=None):
+        self.record(0, now)
+
+
+class RequestMetrics:
+    """Where the time goes: box, network or integration.
+
+    Every call to the box is recorded, rolled over the last METRICS_WINDOW
+    seconds, along with the commands, retries and logins.
+    """
+
+    def __init__(self, window=METRICS_WINDOW, sample_size=METRICS_SAMPLE_SIZE) -> None:
+        self.window = window
+        self.requests = RollingHistogram(window=window)
+        self.commands = RollingHistogram(window=window)
+        self.timeouts = RollingCounter(window)
+        self.retries = RollingCounter(window)
+        self.logins = RollingCounter(window)
+        self.last_request: RequestTiming | None = None
+        self.last_poll: RequestTiming | None = None
+        self.recent: deque[RequestTiming] = deque(maxlen=sample_size)
+
+    def record_request(self, timing: RequestTiming):
+        if timing.total is None:
+            timing.total = time.monotonic() - timing.started
+        self.requests.record(timing.total)
+        if timing.timed_out:
+            self.timeouts.increment()
+        self.last_request = timing
+        self.recent.append(timing)
+        if timing.page == Page.STATUS and timing.status is not None:
+            self.last_poll = timing
+        _LOGGER.debug(
+            "%s %s: status=%s bytes=%s dns=%s connect=%s ttfb=%s total=%.3fs",
+            timing.method.upper(),
+            timing.page.value,
+            timing.status,
+            timing.bytes,
+            timing.dns,
+            timing.connect,
+            timing.ttfb,
+            timing.total,
+        )
+
+    def record_command(self, duration):
+        self.commands.record(duration)
+
+    def record_retry(self):
+        self.retries.increment()
+
+    def record_login(self):
+        self.logins.increment()
+
+    def timeout_rate(self):
+        requests = self.requests.count()
+        if requests == 0:
+            return None
+        return self.timeouts.count() / requests
+
+    def logins_per_hour(self):
+        return self.logins.count() * 3600 / self.window
+
+    def as_dict(self) -> dict:
+        now = time.monotonic()
+        return {
+            "window": self.window,
+            "requests": self.requests.count(now),
+            "request_buckets": dict(
+                zip([*self.requests.bounds, "inf"], self.requests.counts(now))
+            ),
+            "request_p50": self.requests.percentile(50, now),
+            "request_p95": self.requests.percentile(95, now),
+            "commands": self.commands.count(now),
+            "command_p95": self.commands.percentile(95, now),
+            "timeouts": self.timeouts.count(now),
+            "retries": self.retries.count(now),
+            "logins": self.logins.count(now),
+            "recent_requests": [timing.summary(now) for timing in self.recent],
+        }
+
+
+def request_trace_config() -> TraceConfig:
+    """Fill the RequestTiming passed as trace_request_ctx of a request."""
+
+    async def on_dns_resolvehost_start(session, context, params):
+        context.dns_started = time.monotonic()
+
+    async def on_dns_resolvehost_end(session, context, params):
+        timing = context.trace_request_ctx
+        if isinstance(timing, RequestTiming):
+            timing.dns = time.monotonic() - context.dns_started
+
+    async def on_connection_create_start(session, context, params):
+        context.connect_started = time.monotonic()
+
+    async def on_connection_create_end(session, context, params):
+        timing = context.trace_request_ctx
+        if isinstance(timing, RequestTiming):
+            timing.connect = time.monotonic() - context.connect_started
+
+    async def on_request_end(session, context, params):
+        # Fired once the response headers are in
+        timing = context.trace_request_ctx
+        if isinstance(timing, RequestTiming):
+            timing.ttfb = time.monotonic() - timing.started
+
+    trace_config = TraceConfig()
+    trace_config.on_dns_resolvehost_start.append(on_dns_resolvehost_start)
+    trace_config.on_dns_resolvehost_end.append(on_dns_resolvehost_end)
+    trace_config.on_connection_create_start.append(on_connection_create_start)
+    trace_config.on_connection_create_end.append(on_connection_create_end)
+    trace_config.on_request_end.append(on_request_end)
+    return trace_config
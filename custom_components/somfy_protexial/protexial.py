@@ -1,43 +1,41 @@
 import asyncio
 import logging
 import re
-import string
+import time
 from urllib.parse import urlencode
 from xml.etree import ElementTree as ET
 
 from aiohttp import ClientError, ClientSession
-from pyquery import PyQuery as pq
 
-from .const import CHALLENGE_REGEX, HTTP_TIMEOUT, ApiType, Page, Selector, SomfyError
+from .circuit_breaker import CircuitBreaker
+from .client_const import (
+    CHALLENGE_REGEX,
+    GUESS_CONCURRENCY,
+    SESSION_KEEP_ALIVE_WINDOW,
+    ApiType,
+    CommandPriority,
+    Page,
+    Selector,
+    SomfyError,
+)
+from .client_session import HTTP_CLIENT_TIMEOUT
+from .command_queue import CommandQueue
+from .elements import parse_elements
+from .html_parser import extract_text, parse_html
+from .metrics import RequestMetrics, RequestTiming
 from .protexial_api import ProtexialApi
 from .protexial_io_api import ProtexialIOApi
 from .protexiom_api import ProtexiomApi
-from .somfy_exception import SomfyException
+from .response import ProtexialResponse
+from .session_manager import SessionManager
+from .somfy_exception import SomfyAuthException, SomfyException
+from .status import parse_status
 
 _LOGGER: logging.Logger = logging.getLogger(__name__)
 
-_PRINTABLE_CHARS = set(string.printable)
-
-
-class Status:
-    zoneA = "off"
-    zoneB = "off"
-    zoneC = "off"
-    battery = "ok"
-    radio = "ok"
-    door = "ok"
-    alarm = "ok"
-    box = "ok"
-    gsm = "gsm connect au rseau"
-    recgsm = "4"
-    opegsm = "orange"
-    camera = "disabled"
-
-    def __getitem__(self, key):
-        return getattr(self, key)
-
-    def __str__(self):
-        return f"zoneA:{self.zoneA}, zoneB:{self.zoneB}, zoneC:{self.zoneC}, battery:{self.battery}, radio:{self.radio}, door:{self.door}, alarm:{self.alarm}, box:{self.box}, gsm:{self.gsm}, recgsm:{self.recgsm}, opegsm:{self.opegsm}, camera:{self.camera}"
+# Never logged: the session cookie and the pages showing the card codes
+REDACTED_HEADERS = frozenset(["cookie", "set-cookie"])
+REDACTED_PAGES = frozenset([Page.CHALLENGE_CARD])
 
 
 class SomfyProtexial:
@@ -49,6 +47,7 @@ class SomfyProtexial:
         username=None,
         password=None,
         codes=None,
+        keep_alive_window=SESSION_KEEP_ALIVE_WINDOW,
     ) -> None:
         self.url = url
         self.api_type = api_type
@@ -56,9 +55,23 @@ class SomfyProtexial:
         self.password = password
         self.codes = codes
         self.session = session
-        self.cookie = None
+        self.session_manager = SessionManager(keep_alive_window=keep_alive_window)
+        self.commands = CommandQueue()
+        self.circuit_breaker = CircuitBreaker()
+        self.metrics = RequestMetrics()
+        self._last_status = None
+        self._last_status_body = None
+        self._status_validators = {}
+        self._guess_challenge = None
+        self._guess_bodies = {}
+        self.firmware = None
+        self._keep_alive_enabled = False
         self.api = self.load_api(self.api_type)
 
+    @property
+    def cookie(self):
+        return self.session_manager.cookie
+
     async def __do_call(
         self,
         method,
@@ -71,81 +84,114 @@ class SomfyProtexial:
     ):
         if headers is None:
             headers = {}
+        if authenticated and login and self.session_manager.is_expired():
+            # Don't waste a round trip on a session the box already dropped
+            await self.__login(self.session_manager.generation)
+        self.circuit_breaker.before_request()
 
         try:
             path = self.api.get_page(page)
             full_path = self.url + path
+            generation = self.session_manager.generation
             if self.cookie and authenticated:
                 headers["Cookie"] = self.cookie
             if data:
                 headers["Content-Type"] = "application/x-www-form-urlencoded"
 
-            async with asyncio.timeout(HTTP_TIMEOUT):
-                _LOGGER.debug(f"Call to: {full_path}")
-                if method == "get":
-                    response = await self.session.get(full_path, headers=headers)
-                elif method == "post":
-                    encodedData = urlencode(data, encoding=self.api.get_encoding())
-                    _LOGGER.debug(f"With payload: {data}")
-                    _LOGGER.debug(f"With payload (encoded): {encodedData}")
-                    response = await self.session.post(
-                        self.url + path, data=encodedData, headers=headers
+            _LOGGER.debug("Call to: %s", full_path)
+            timing = RequestTiming(page, method, time.monotonic())
+            if method == "get":
+                request = self.session.get(
+                    full_path,
+                    headers=headers,
+                    timeout=HTTP_CLIENT_TIMEOUT,
+                    trace_request_ctx=timing,
+                )
+            elif method == "post":
+                encodedData = urlencode(data, encoding=self.api.get_encoding())
+                # The login form holds the password and a code of the card
+                if page != Page.LOGIN:
+                    _LOGGER.debug("With payload: %s", data)
+                    _LOGGER.debug("With payload (encoded): %s", encodedData)
+                request = self.session.post(
+                    self.url + path,
+                    data=encodedData,
+                    headers=headers,
+                    timeout=HTTP_CLIENT_TIMEOUT,
+                    trace_request_ctx=timing,
+                )
+            try:
+                async with request as client_response:
+                    response = await ProtexialResponse.read(
+                        client_response, self.api.get_encoding()
                     )
-            _LOGGER.debug(f"Response path: {response.real_url.path}")
-            _LOGGER.debug(f"Response headers: {response.headers}")
-            _LOGGER.debug(
-                f"Response body: {await response.text(self.api.get_encoding())}"
-            )
+            except (asyncio.TimeoutError, ClientError) as exception:
+                timing.timed_out = isinstance(exception, asyncio.TimeoutError)
+                self.metrics.record_request(timing)
+                self.circuit_breaker.record_failure()
+                raise
+            except asyncio.CancelledError:
+                self.circuit_breaker.release()
+                raise
+            timing.status = response.status
+            timing.bytes = len(response.body)
+            self.metrics.record_request(timing)
+            if response.status >= 500:
+                self.circuit_breaker.record_failure()
+            else:
+                self.circuit_breaker.record_success()
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug("Response path: %s", response.real_url.path)
+                _LOGGER.debug("Response headers: %s", redact_headers(response.headers))
+                if page not in REDACTED_PAGES:
+                    _LOGGER.debug("Response body: %s", response.text)
 
             if response.status == 200:
                 if (
                     response.real_url.path == self.api.get_page(Page.DEFAULT)
                     and retry is True
                 ):
-                    await self.__login()
+                    await self.__login(generation, retry=True)
                     return await self.__do_call(
                         method, page, headers, data, retry=False, login=False
                     )
                 elif response.real_url.path == self.api.get_page(Page.ERROR):
-                    errorPageContent = await response.text(self.api.get_encoding())
-                    dom = pq(errorPageContent)
-                    error_element = dom(self.api.get_selector(Selector.ERROR_CODE))
-                    if not error_element:
+                    errorPageContent = response.text
+                    errorCode = self.__extract(errorPageContent, Selector.ERROR_CODE)
+                    if not errorCode:
                         _LOGGER.error(errorPageContent)
                         raise SomfyException("Unknown error")
-                    errorCode = error_element.text()
                     if (
                         errorCode == SomfyError.NOT_AUTHORIZED
                         and not self.cookie
                         and retry is True
                     ):
-                        await self.__login()
+                        await self.__login(generation, retry=True)
                         return await self.__do_call(
                             method, page, headers, data, retry=False, login=False
                         )
                     elif errorCode == SomfyError.SESSION_ALREADY_OPEN:
                         if retry:
-                            form = self.api.get_reset_session_payload()
-                            await self.__do_call(
-                                "post",
-                                Page.ERROR,
-                                data=form,
-                                retry=False,
-                            )
-                            self.cookie = None
                             if login:
-                                await self.__login()
+                                await self.__login(
+                                    generation, reset_session=True, retry=True
+                                )
+                            else:
+                                self.__consume_retry()
+                                await self.__reset_session()
                             return await self.__do_call(
                                 method, page, headers, data, retry=False, login=login
                             )
                         else:
                             raise SomfyException("Too many login retries")
                     elif errorCode == SomfyError.WRONG_CREDENTIALS:
-                        raise SomfyException("Login failed: Wrong credentials")
+                        raise SomfyAuthException("Login failed: Wrong credentials")
                     elif errorCode == SomfyError.MAX_LOGIN_ATTEMPS:
-                        raise SomfyException("Login failed: Max attempt count reached")
+                        raise SomfyAuthException(
+                            "Login failed: Max attempt count reached"
+                        )
                     elif errorCode == SomfyError.WRONG_CODE:
-                        raise SomfyException("Login failed: Wrong code")
+                        raise SomfyAuthException("Login failed: Wrong code")
                     elif errorCode == SomfyError.UNKNOWN_PARAMETER:
                         raise SomfyException("Command failed: Unknown parameter")
                     else:
@@ -154,7 +200,11 @@ class SomfyProtexial:
                             f"Command failed: Unknown errorCode: {errorCode}"
                         )
                 else:
+                    if authenticated:
+                        self.session_manager.touch()
                     return response
+            elif response.status == 304:
+                return response
             else:
                 raise SomfyException(f"Http error ({response.status})")
         except asyncio.TimeoutError as exception:
@@ -176,6 +226,8 @@ class SomfyProtexial:
             raise SomfyException(
                 f"Error fetching information from {path} - {exception}"
             )
+        except SomfyException:
+            raise
         except Exception as exception:  # pylint: disable=broad-except
             _LOGGER.error("Something really wrong happened! - %s", exception)
             raise SomfyException(f"Something really wrong happened! - {exception}")
@@ -183,31 +235,66 @@ class SomfyProtexial:
     async def init(self):
         await self.__login()
 
+    def start_keep_alive(self):
+        self._keep_alive_enabled = True
+        self.session_manager.note_activity()
+        self.session_manager.start_keep_alive(self.keep_alive, self.release_session)
+
+    async def keep_alive(self):
+        # Any authenticated page resets the box idle timer, re-login if it's gone
+        await self.__do_call("get", Page.PILOTAGE)
+
     async def get_version(self):
         version_string = "Unknown"
         try:
-            error_response = await self.__do_call(
-                "get", Page.LOGIN, login=False, authenticated=False
-            )
-            dom = pq(await error_response.text(self.api.get_encoding()))
-            footer_element = dom(self.api.get_selector(Selector.FOOTER))
-            if footer_element is not None:
-                matches = re.search(
-                    r"([0-9]{4}) somfy", footer_element.text(), re.IGNORECASE
+            login_body = self._guess_bodies.get(Page.LOGIN)
+            if login_body is None:
+                error_response = await self.__do_call(
+                    "get", Page.LOGIN, login=False, authenticated=False
                 )
-                if len(matches.groups()) > 0:
-                    version_string = matches.group(1)
+                login_body = error_response.text
+            footer = self.__extract(login_body, Selector.FOOTER)
+            matches = re.search(r"([0-9]{4}) somfy", footer, re.IGNORECASE)
+            if len(matches.groups()) > 0:
+                version_string = matches.group(1)
 
             if self.api.get_page(Page.VERSION) is not None:
-                response = await self.__do_call(
-                    "get", Page.VERSION, login=False, authenticated=False
-                )
-                version = await response.text(self.api.get_encoding())
-                version_string += f" ({version.strip()})"
+                version = self._guess_bodies.get(Page.VERSION)
+                if version is None:
+                    response = await self.__do_call(
+                        "get", Page.VERSION, login=False, authenticated=False
+                    )
+                    version = response.text
+                self.firmware = version.strip()
+                version_string += f" ({self.firmware})"
         except Exception as exception:
             _LOGGER.error("Failed to extract version: %s", exception)
         return version_string
 
+    @property
+    def fingerprint(self):
+        return {
+            "api_type": ApiType(self.api_type).value,
+            "firmware": self.firmware,
+            "pages": {page.value: path for page, path in self.api.pages.items()},
+            "encoding": self.api.get_encoding(),
+        }
+
+    async def check_fingerprint(self, fingerprint) -> bool:
+        """Cheaply check the centrale is still the one detected at setup."""
+        if fingerprint is None:
+            return False
+        # The page map or the encoding of the model changed with an update
+        if fingerprint != {**self.fingerprint, "firmware": fingerprint["firmware"]}:
+            return False
+        if self.api.get_page(Page.VERSION) is None:
+            return True
+        response = await self.__do_call(
+            "get", Page.VERSION, login=False, authenticated=False
+        )
+        self.firmware = response.text.strip()
+        return self.firmware == fingerprint["firmware"]
+
     def load_api(self, api_type: ApiType):
         if api_type == ApiType.PROTEXIAL:
             return ProtexialApi()
@@ -219,50 +306,114 @@ class SomfyProtexial:
             raise SomfyException(f"Unknown api type: {type}")
 
     async def guess_and_set_api_type(self):
-        for api_type in [ApiType.PROTEXIAL_IO, ApiType.PROTEXIAL, ApiType.PROTEXIOM]:
-            self.api = self.load_api(api_type)
-            has_version_page = False
-            # Some older systems don't have a version page
-            versionPage = self.api.get_page(Page.VERSION)
-            if versionPage is not None:
-                has_version_page = True
-                version_body = await self.do_guess_get(versionPage)
-
-            # Either the system doesn't have a version page, or the page was successfully retrieved
-            if not has_version_page or version_body is not None:
-                # Now check the login page
-                loginPage = self.api.get_page(Page.LOGIN)
-                login_body = await self.do_guess_get(loginPage)
-                if login_body is not None:
-                    # The system has a login page
-                    dom = pq(login_body)
-                    challenge_element = dom(
-                        self.api.get_selector(Selector.LOGIN_CHALLENGE)
-                    )
-                    # Check if the challenge element is present
-                    if challenge_element is not None:
-                        challenge = challenge_element.text()
-                        # Check that the challenge element looks fine
-                        if re.match(CHALLENGE_REGEX, challenge):
-                            self.api_type = api_type
-                            return self.api_type
-                        else:
-                            _LOGGER.debug(f"Challenge not recognized: {challenge}")
+        api_types = [ApiType.PROTEXIAL_IO, ApiType.PROTEXIAL, ApiType.PROTEXIOM]
+        semaphore = asyncio.Semaphore(GUESS_CONCURRENCY)
+        fetches = {}
+
+        async def fetch(page):
+            # Protexial and Protexial IO share their pages, only fetch them once
+            if page not in fetches:
+                fetches[page] = asyncio.create_task(self.do_guess_get(page, semaphore))
+            return await asyncio.shield(fetches[page])
+
+        guesses = {
+            api_type: asyncio.create_task(self.__guess(self.load_api(api_type), fetch))
+            for api_type in api_types
+        }
+        error = None
+        try:
+            # Models are probed at once but still win in this order of precedence
+            for api_type in api_types:
+                try:
+                    guess = await guesses[api_type]
+                except SomfyException as exception:
+                    error = error or exception
+                    continue
+                if guess is None:
+                    continue
+                challenge, login_body, version_body = guess
+                self.api_type = api_type
+                self.api = self.load_api(api_type)
+                login_page = self.api.get_page(Page.LOGIN)
+                if self.__is_last_login_page(fetches, login_page):
+                    self._guess_challenge = challenge
+                self._guess_bodies = {
+                    Page.LOGIN: login_body,
+                    Page.VERSION: version_body,
+                }
+                return self.api_type
+        finally:
+            tasks = [*guesses.values(), *fetches.values()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        if error is not None:
+            raise error
         raise SomfyException("Couldn't detect the centrale type")
 
-    async def do_guess_get(self, page) -> str:
+    async def __guess(self, api, fetch):
+        version_body = None
+        # Some older systems don't have a version page
+        versionPage = api.get_page(Page.VERSION)
+        if versionPage is not None:
+            version_body = self.__decode_guess(await fetch(versionPage), api)
+            if version_body is None:
+                return None
+
+        # Either the system doesn't have a version page, or the page was successfully retrieved
+        login_body = self.__decode_guess(await fetch(api.get_page(Page.LOGIN)), api)
+        if login_body is None:
+            return None
+        # The system has a login page, the DOM tells the models apart
+        dom = parse_html(login_body)
+        challenge_element = dom(api.get_selector(Selector.LOGIN_CHALLENGE))
+        # Check if the challenge element is present
+        if challenge_element is not None:
+            challenge = challenge_element.text()
+            # Check that the challenge element looks fine
+            if re.match(CHALLENGE_REGEX, challenge):
+                return challenge, login_body, version_body
+            _LOGGER.debug("Challenge not recognized: %s", challenge)
+        return None
+
+    def __decode_guess(self, response, api):
+        if response is None:
+            return None
         try:
-            async with asyncio.timeout(HTTP_TIMEOUT):
-                _LOGGER.debug(f"Guess '{self.url + page}'")
-                response = await self.session.get(
-                    self.url + page, headers={}, allow_redirects=False
-                )
+            response_body = response.body.decode(api.get_encoding())
+            _LOGGER.debug("Guess response: %s", response_body)
+            return response_body
+        except UnicodeDecodeError as exception:
+            _LOGGER.error(
+                "Incompatible encoding found in '%s' - %s", response.real_url, exception
+            )
+        return None
+
+    def __is_last_login_page(self, fetches, login_page):
+        # Every login page served renews the challenge, the detected one is
+        # only still valid if no other model's login page reached the box
+        for page, task in fetches.items():
+            if page == login_page or page == self.api.get_page(Page.VERSION):
+                continue
+            if not task.done() or task.cancelled() or task.exception() is not None:
+                return False
+            if task.result() is not None:
+                return False
+        return True
+
+    async def do_guess_get(self, page, semaphore) -> ProtexialResponse:
+        try:
+            async with semaphore:
+                _LOGGER.debug("Guess '%s'", self.url + page)
+                async with self.session.get(
+                    self.url + page,
+                    headers={},
+                    allow_redirects=False,
+                    timeout=HTTP_CLIENT_TIMEOUT,
+                ) as client_response:
+                    response = await ProtexialResponse.read(client_response, None)
             if response.status == 200:
-                response_body = await response.text(self.api.get_encoding())
-                _LOGGER.debug(
-                    f"Guess response: {await response.text(self.api.get_encoding())}"
-                )
-                return response_body
+                return response
             elif response.status == 302:
                 raise SomfyException("Unavailable, please retry later")
             # Looks like another model
@@ -274,10 +425,6 @@ class SomfyProtexial:
             raise SomfyException(
                 f"Error fetching from '{self.url + page}'"
             ) from exception
-        except UnicodeDecodeError as exception:
-            _LOGGER.error(
-                "Incompatible encoding found in '%s' - %s", self.url + page, exception
-            )
         except SomfyException:
             raise
         except Exception as exception:
@@ -289,81 +436,123 @@ class SomfyProtexial:
         return None
 
     async def get_challenge(self):
-        login_response = await self.__do_call("get", Page.LOGIN, login=False)
-        dom = pq(await login_response.text(self.api.get_encoding()))
-        challenge_element = dom(self.api.get_selector(Selector.LOGIN_CHALLENGE))
-        if challenge_element:
-            return challenge_element.text()
+        if self._guess_challenge is not None:
+            # Shown by the detection, a challenge is only good for one login
+            challenge, self._guess_challenge = self._guess_challenge, None
+            return challenge
+        # Runs under the session lock during a login, a retry would log in
+        # again and wait on that lock forever
+        login_response = await self.__do_call(
+            "get", Page.LOGIN, retry=False, login=False
+        )
+        challenge = self.__extract(login_response.text, Selector.LOGIN_CHALLENGE)
+        if challenge:
+            return challenge
         else:
             raise SomfyException("Challenge not found")
 
-    async def __login(self, username=None, password=None, code=None):
-        self.cookie = None
-        if code is None:
-            challenge = await self.get_challenge()
-            code = self.codes[challenge]
-
-        form = self.api.get_login_payload(
-            username if username else self.username,
-            password if password else self.password,
-            code,
+    def __extract(self, content, selector):
+        return extract_text(
+            content,
+            self.api.get_selector(selector),
+            self.api.get_extractor(selector),
         )
-        login_response = await self.__do_call(
-            "post", Page.LOGIN, data=form, retry=False, login=False
-        )
-        self.cookie = login_response.headers.get("SET-COOKIE")
+
+    async def __login(
+        self,
+        generation=None,
+        username=None,
+        password=None,
+        code=None,
+        reset_session=False,
+        retry=False,
+    ):
+        # Single flight: concurrent callers wait for the first login and reuse it
+        async with self.session_manager.lock:
+            if generation is not None and self.session_manager.is_renewed_since(
+                generation
+            ):
+                _LOGGER.debug("Session already renewed by another call")
+                return
+            if retry:
+                # Only the call actually logging in again spends the budget
+                self.__consume_retry()
+            if reset_session:
+                await self.__reset_session()
+            self.session_manager.close()
+            if code is None:
+                challenge = await self.get_challenge()
+                code = self.codes[challenge]
+
+            self.metrics.record_login()
+            form = self.api.get_login_payload(
+                username if username else self.username,
+                password if password else self.password,
+                code,
+            )
+            login_response = await self.__do_call(
+                "post", Page.LOGIN, data=form, retry=False, login=False
+            )
+            self.session_manager.open(login_response.headers.get("SET-COOKIE"))
+
+    def __consume_retry(self):
+        self.circuit_breaker.consume_retry()
+        self.metrics.record_retry()
+
+    async def __reset_session(self):
+        form = self.api.get_reset_session_payload()
+        await self.__do_call("post", Page.ERROR, data=form, retry=False, login=False)
+        self.session_manager.close()
+
+    async def release_session(self):
+        if self.cookie is not None:
+            await self.__do_call("get", Page.LOGOUT, retry=False, login=False)
+        self.session_manager.close()
 
     async def logout(self):
-        await self.__do_call("get", Page.LOGOUT, retry=False, login=False)
-        self.cookie = None
+        self._keep_alive_enabled = False
+        await self.session_manager.stop_keep_alive()
+        await self.commands.stop()
+        await self.release_session()
 
     async def get_status(self):
         status_response = await self.__do_call(
-            "get", Page.STATUS, login=False, authenticated=False
+            "get",
+            Page.STATUS,
+            headers=dict(self._status_validators),
+            login=False,
+            authenticated=False,
         )
-        content = await status_response.text(self.api.get_encoding())
-        response = ET.fromstring(content)
-        status = Status()
-        for child in response:
-            filteredChildText = self.filter_ascii(child.text)
-            match child.tag:
-                case "defaut0":
-                    status.battery = filteredChildText
-                case "defaut1":
-                    status.radio = filteredChildText
-                case "defaut2":
-                    status.door = filteredChildText
-                case "defaut3":
-                    status.alarm = filteredChildText
-                case "defaut4":
-                    status.box = filteredChildText
-                case "zone0":
-                    status.zoneA = filteredChildText
-                case "zone1":
-                    status.zoneB = filteredChildText
-                case "zone2":
-                    status.zoneC = filteredChildText
-                case "gsm":
-                    status.gsm = filteredChildText
-                case "recgsm":
-                    status.recgsm = filteredChildText
-                case "opegsm":
-                    status.opegsm = filteredChildText
-                case "camera":
-                    status.camera = filteredChildText
-        return status
-
-    def filter_ascii(self, value) -> str:
-        if value is None:
-            return value
-        filtered = "".join(filter(lambda x: x in _PRINTABLE_CHARS, value))
-        _LOGGER.debug("Filtered status: '%s'", filtered.lower())
-        return filtered.lower()
+        if status_response.status == 304 and self._last_status is not None:
+            return self._last_status
+        body = status_response.body
+        # Most polls return the very same document, no need to decode it again
+        if body != self._last_status_body or self._last_status is None:
+            try:
+                status = parse_status(body.decode(self.api.get_encoding()))
+            except (ET.ParseError, UnicodeDecodeError) as exception:
+                # Empty or truncated while the box reboots
+                raise SomfyException(f"Invalid status: {exception}")
+            self._last_status = status
+            self._last_status_body = body
+        self.__store_status_validators(status_response.headers)
+        return self._last_status
+
+    async def get_elements(self):
+        elements_response = await self.__do_call("get", Page.ELEMENTS)
+        return parse_elements(elements_response.text)
+
+    def __store_status_validators(self, headers):
+        self._status_validators = {}
+        if "ETag" in headers:
+            self._status_validators["If-None-Match"] = headers["ETag"]
+        if "Last-Modified" in headers:
+            self._status_validators["If-Modified-Since"] = headers["Last-Modified"]
 
     async def get_challenge_card(self, username, password, code):
-        await self.__login(username, password, code)
+        await self.__login(username=username, password=password, code=code)
         status_response = await self.__do_call("get", Page.CHALLENGE_CARD, login=False)
-        dom = pq(await status_response.text(self.api.get_encoding()))
+        dom = parse_html(status_response.text)
         all_challenge_elements = dom(self.api.get_selector(Selector.CHALLENGE_CARD))
         challenges = {}
         chars = ["A", "B", "C", "D", "E", "F"]
@@ -379,31 +568,56 @@ class SomfyProtexial:
         await self.logout()
         return challenges
 
+    async def __send_command(self, form, priority, key=None):
+        started = time.monotonic()
+        if self._keep_alive_enabled:
+            # Keep the session warm again, the loop stops once idle
+            self.start_keep_alive()
+        response = await self.commands.submit(
+            lambda: self.__do_call("post", Page.PILOTAGE, data=form), priority, key
+        )
+        # From the call to the box answer, queueing and re-login included
+        self.metrics.record_command(time.monotonic() - started)
+        return response
+
     async def arm(self, zone):
         form = self.api.get_arm_payload(zone)
-        await self.__do_call("post", Page.PILOTAGE, data=form)
+        await self.__send_command(form, CommandPriority.ALARM)
+
+    async def arm_zones(self, zones):
+        # The firmwares have a button per zone and one for all of them, a
+        # partial combination takes a request per zone. Stop at the first
+        # failure so a half armed box doesn't go unnoticed
+        for zone in zones:
+            await self.arm(zone)
 
     async def disarm(self):
         form = self.api.get_disarm_payload()
-        await self.__do_call("post", Page.PILOTAGE, data=form)
+        await self.__send_command(form, CommandPriority.ALARM)
 
     async def turn_light_on(self):
         form = self.api.get_turn_light_on_payload()
-        await self.__do_call("post", Page.PILOTAGE, data=form)
+        await self.__send_command(form, CommandPriority.DEVICE, "light")
 
     async def turn_light_off(self):
         form = self.api.get_turn_light_off_payload()
-        await self.__do_call("post", Page.PILOTAGE, data=form)
+        await self.__send_command(form, CommandPriority.DEVICE, "light")
 
     async def open_cover(self):
         form = self.api.get_open_cover_payload()
-        await self.__do_call("post", Page.PILOTAGE, data=form)
+        await self.__send_command(form, CommandPriority.DEVICE, "cover")
 
     async def close_cover(self):
         form = self.api.get_close_cover_payload()
-        response = await self.__do_call("post", Page.PILOTAGE, data=form)
-        print(await response.text(self.api.get_encoding()))
+        await self.__send_command(form, CommandPriority.DEVICE, "cover")
 
     async def stop_cover(self):
         form = self.api.get_stop_cover_payload()
-        await self.__do_call("post", Page.PILOTAGE, data=form)
+        await self.__send_command(form, CommandPriority.DEVICE, "cover")
+
+
+def redact_headers(headers) -> dict:
+    return {
+        name: "**REDACTED**" if name.lower() in REDACTED_HEADERS else value
+        for name, value in headers.items()
+    }
@@ -1,5 +1,5 @@
 from .abstract_api import AbstractApi
-from .const import Page, Selector, Zone
+from .client_const import Page, Selector, Zone
 
 
 class ProtexialApi(AbstractApi):
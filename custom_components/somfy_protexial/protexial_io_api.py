@@ -1,5 +1,7 @@
+import re
+
 from .abstract_api import AbstractApi
-from .const import Page, Selector, Zone
+from .client_const import Page, Selector, Zone
 
 
 class ProtexialIOApi(AbstractApi):
@@ -22,6 +24,13 @@ class ProtexialIOApi(AbstractApi):
             Selector.FOOTER: "[id^='menu_footer']",
             Selector.CHALLENGE_CARD: "td:not([class])",
         }
+        # The challenge sits in a div rather than a table cell
+        self.extractors = {
+            **self.extractors,
+            Selector.LOGIN_CHALLENGE: re.compile(
+                r"id=[\"']?form_id\b.*?<div[^>]*>\s*<b>([A-F][1-5])</b>", re.DOTALL
+            ),
+        }
         self.encoding = "utf-8"
 
     def get_login_payload(self, username, password, code):
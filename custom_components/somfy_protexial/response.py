@@ -0,0 +1,23 @@
+from functools import cached_property
+
+from aiohttp import ClientResponse
+
+
+class ProtexialResponse:
+    """A response whose body is read once and decoded at most once."""
+
+    def __init__(self, status, headers, real_url, body: bytes, encoding) -> None:
+        self.status = status
+        self.headers = headers
+        self.real_url = real_url
+        self.body = body
+        self.encoding = encoding
+
+    @classmethod
+    async def read(cls, response: ClientResponse, encoding):
+        body = await response.read()
+        return cls(response.status, response.headers, response.real_url, body, encoding)
+
+    @cached_property
+    def text(self) -> str:
+        return self.body.decode(self.encoding)
@@ -0,0 +1,80 @@
+import time
+
+from .const import ACTIVITY_FIELDS, ACTIVITY_WINDOW, FAILURE_BACKOFF_FACTOR
+
+
+class AdaptiveScheduler:
+    """Pick the delay before the next status poll.
+
+    Polls run at the floor interval while the alarm is armed or right after a
+    command or a door/alarm change, then back off exponentially up to the
+    ceiling once everything is idle, and even faster when the box fails.
+    """
+
+    def __init__(self, floor, ceiling, activity_window=ACTIVITY_WINDOW) -> None:
+        self.floor = floor
+        self.ceiling = max(floor, ceiling)
+        self.activity_window = activity_window
+        self.interval = floor
+        self.last_activity = None
+
+    def note_activity(self):
+        self.last_activity = time.monotonic()
+        self.interval = self.floor
+
+    def is_active(self) -> bool:
+        return (
+            self.last_activity is not None
+            and time.monotonic() - self.last_activity < self.activity_window
+        )
+
+    def on_success(self, status, changed_fields) -> float:
+        if not ACTIVITY_FIELDS.isdisjoint(changed_fields):
+            self.note_activity()
+        armed = "on" in (status.zoneA, status.zoneB, status.zoneC)
+        if armed or self.is_active():
+            self.interval = self.floor
+        else:
+            self.interval = min(self.ceiling, self.interval * 2)
+        return self.interval
+
+    def on_failure(self) -> float:
+        self.interval = min(self.ceiling, self.interval * FAILURE_BACKOFF_FACTOR)
+        return self.interval
+
+    def watch_interval(self, fast) -> float:
+        """Delay before the status watcher reads the box again.
+
+        Fast only during the activity window, the poll interval otherwise so
+        an idle box isn't read more often than the polls back off to.
+        """
+        if self.is_active():
+            return min(fast, self.interval)
+        return self.interval
+
+
+class PollSpreader:
+    """Shared by all the boxes to spread their polls over their interval.
+
+    Each box gets its own phase, polls are delayed to the next time matching
+    that phase so boxes set up together don't poll in sync.
+    """
+
+    def __init__(self) -> None:
+        self._boxes = []
+
+    def add(self, key):
+        self._boxes.append(key)
+
+    def remove(self, key):
+        self._boxes.remove(key)
+
+    def delay(self, key, interval) -> float:
+        if len(self._boxes) < 2:
+            return interval
+        offset = interval * self._boxes.index(key) / len(self._boxes)
+        delay = (offset - time.monotonic()) % interval
+        # Never poll much earlier or later than the scheduler asked
+        if delay < interval / 2:
+            delay += interval
+        return delay
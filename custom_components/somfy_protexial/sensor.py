@@ -0,0 +1,257 @@
+import logging
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorStateClass,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import PERCENTAGE, EntityCategory, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import COORDINATOR, DEVICE_INFO, DOMAIN, CircuitState
+from .entity import ProtexialEntity
+from .metrics import RequestMetrics
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    coordinator = hass.data[DOMAIN][config_entry.entry_id][COORDINATOR]
+    device_info = hass.data[DOMAIN][config_entry.entry_id][DEVICE_INFO]
+    sensors = []
+    sensors.append(
+        ProtexialScanIntervalSensor(config_entry.entry_id, device_info, coordinator)
+    )
+    sensors.append(
+        ProtexialCircuitSensor(config_entry.entry_id, device_info, coordinator)
+    )
+    for sensor_class in [
+        ProtexialPollLatencySensor,
+        ProtexialCommandLatencySensor,
+        ProtexialLoginRateSensor,
+        ProtexialTimeoutRateSensor,
+    ]:
+        sensors.append(sensor_class(config_entry.entry_id, device_info, coordinator))
+    async_add_entities(sensors)
+
+
+class ProtexialDiagnosticSensor(ProtexialEntity, SensorEntity):
+    """Sensor on the integration itself rather than on status fields.
+
+    Without status fields it is notified of every poll, its state is only
+    written when it changed.
+    """
+
+    _written_state = None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        state = (self.native_value, self.extra_state_attributes)
+        if state == self._written_state:
+            return
+        self._written_state = state
+        self.async_write_ha_state()
+
+
+class ProtexialScanIntervalSensor(ProtexialDiagnosticSensor):
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_native_unit_of_measurement = UnitOfTime.SECONDS
+
+    def __init__(self, entry_id, device_info, coordinator) -> None:
+        super().__init__(coordinator)
+        self._attr_unique_id = f"{entry_id}_sensor_scan_interval"
+        self._attr_device_info = device_info
+
+    @property
+    def name(self):
+        return "Intervalle de rafraîchissement"
+
+    @property
+    def icon(self):
+        return "mdi:timer-sync-outline"
+
+    @property
+    def available(self) -> bool:
+        # Still meaningful while the box doesn't answer
+        return True
+
+    @property
+    def native_value(self):
+        return self.coordinator.scheduler.interval
+
+
+class ProtexialCircuitSensor(ProtexialDiagnosticSensor):
+    _attr_device_class = SensorDeviceClass.ENUM
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_options = [state.value for state in CircuitState]
+
+    def __init__(self, entry_id, device_info, coordinator) -> None:
+        super().__init__(coordinator)
+        self._attr_unique_id = f"{entry_id}_sensor_circuit_state"
+        self._attr_device_info = device_info
+
+    @property
+    def name(self):
+        return "Etat de la connexion"
+
+    @property
+    def icon(self):
+        if self.native_value == CircuitState.CLOSED:
+            return "mdi:lan-connect"
+        return "mdi:lan-disconnect"
+
+    @property
+    def available(self) -> bool:
+        return True
+
+    @property
+    def native_value(self):
+        return self.coordinator.protexial.circuit_breaker.state.value
+
+    @property
+    def extra_state_attributes(self):
+        return {"failures": self.coordinator.protexial.circuit_breaker.failures}
+
+
+class ProtexialMetricsSensor(ProtexialDiagnosticSensor):
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    # Change on nearly every poll, each state lands in the recorder: opt-in
+    _attr_entity_registry_enabled_default = False
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, entry_id, device_info, coordinator, key) -> None:
+        super().__init__(coordinator)
+        self._attr_unique_id = f"{entry_id}_sensor_{key}"
+        self._attr_device_info = device_info
+
+    @property
+    def metrics(self) -> RequestMetrics:
+        return self.coordinator.protexial.metrics
+
+    @property
+    def available(self) -> bool:
+        # Most useful while the box doesn't answer
+        return True
+
+
+class ProtexialPollLatencySensor(ProtexialMetricsSensor):
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+
+    def __init__(self, entry_id, device_info, coordinator) -> None:
+        super().__init__(entry_id, device_info, coordinator, "poll_latency")
+
+    @property
+    def name(self):
+        return "Durée de la dernière lecture d'état"
+
+    @property
+    def icon(self):
+        return "mdi:timer-outline"
+
+    @property
+    def native_value(self):
+        poll = self.metrics.last_poll
+        return None if poll is None else to_ms(poll.total)
+
+    @property
+    def extra_state_attributes(self):
+        poll = self.metrics.last_poll
+        if poll is None:
+            return None
+        return {
+            "status": poll.status,
+            "bytes": poll.bytes,
+            "dns_ms": to_ms(poll.dns),
+            "connect_ms": to_ms(poll.connect),
+            "ttfb_ms": to_ms(poll.ttfb),
+        }
+
+
+class ProtexialCommandLatencySensor(ProtexialMetricsSensor):
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+
+    def __init__(self, entry_id, device_info, coordinator) -> None:
+        super().__init__(entry_id, device_info, coordinator, "command_latency_p95")
+
+    @property
+    def name(self):
+        return "Durée des commandes (p95)"
+
+    @property
+    def icon(self):
+        return "mdi:timer-play-outline"
+
+    @property
+    def native_value(self):
+        return to_ms(self.metrics.commands.percentile(95))
+
+    @property
+    def extra_state_attributes(self):
+        return {
+            "p50_ms": to_ms(self.metrics.commands.percentile(50)),
+            "commands": self.metrics.commands.count(),
+        }
+
+
+class ProtexialLoginRateSensor(ProtexialMetricsSensor):
+    _attr_native_unit_of_measurement = "connexions/h"
+
+    def __init__(self, entry_id, device_info, coordinator) -> None:
+        super().__init__(entry_id, device_info, coordinator, "logins_per_hour")
+
+    @property
+    def name(self):
+        return "Connexions par heure"
+
+    @property
+    def icon(self):
+        return "mdi:login"
+
+    @property
+    def native_value(self):
+        return round(self.metrics.logins_per_hour(), 1)
+
+    @property
+    def extra_state_attributes(self):
+        return {"retries": self.metrics.retries.count()}
+
+
+class ProtexialTimeoutRateSensor(ProtexialMetricsSensor):
+    _attr_native_unit_of_measurement = PERCENTAGE
+
+    def __init__(self, entry_id, device_info, coordinator) -> None:
+        super().__init__(entry_id, device_info, coordinator, "timeout_rate")
+
+    @property
+    def name(self):
+        return "Taux de timeout"
+
+    @property
+    def icon(self):
+        return "mdi:timer-alert-outline"
+
+    @property
+    def native_value(self):
+        rate = self.metrics.timeout_rate()
+        return None if rate is None else round(rate * 100, 1)
+
+    @property
+    def extra_state_attributes(self):
+        return {
+            "requests": self.metrics.requests.count(),
+            "timeouts": self.metrics.timeouts.count(),
+            "p95_ms": to_ms(self.metrics.requests.percentile(95)),
+        }
+
+
+def to_ms(seconds):
+    return None if seconds is None else round(seconds * 1000, 1)
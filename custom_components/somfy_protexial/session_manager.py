@@ -0,0 +1,146 @@
+import asyncio
+import logging
+import time
+
+from .client_const import (
+    SESSION_IDLE_TIMEOUT,
+    SESSION_KEEP_ALIVE_WINDOW,
+    SESSION_MAX_RENEW_BACKOFF,
+    SESSION_RENEW_MARGIN,
+)
+from .somfy_exception import SomfyAuthException, SomfyException
+
+_LOGGER: logging.Logger = logging.getLogger(__name__)
+
+
+class SessionManager:
+    """Keep track of the authenticated session cookie and keep it warm.
+
+    The session is only kept warm for keep_alive_window seconds after the last
+    activity, then released. A window of 0 never keeps it warm, the box drops
+    it after its own idle timeout.
+    """
+
+    def __init__(
+        self,
+        idle_timeout=SESSION_IDLE_TIMEOUT,
+        renew_margin=SESSION_RENEW_MARGIN,
+        keep_alive_window=SESSION_KEEP_ALIVE_WINDOW,
+        max_renew_backoff=SESSION_MAX_RENEW_BACKOFF,
+    ) -> None:
+        self.idle_timeout = idle_timeout
+        self.renew_margin = renew_margin
+        self.keep_alive_window = keep_alive_window
+        self.max_renew_backoff = max_renew_backoff
+        self.cookie = None
+        self.opened_at = None
+        self.last_used_at = None
+        self.last_activity_at = None
+        self.generation = 0
+        self.lock = asyncio.Lock()
+        self._keep_alive_task = None
+
+    def open(self, cookie):
+        if cookie is None:
+            self.close()
+            return
+        now = time.monotonic()
+        self.cookie = cookie
+        self.generation += 1
+        self.opened_at = now
+        self.last_used_at = now
+
+    def close(self):
+        self.cookie = None
+        self.opened_at = None
+        self.last_used_at = None
+
+    def note_activity(self):
+        self.last_activity_at = time.monotonic()
+
+    def touch(self):
+        if self.cookie is not None:
+            self.last_used_at = time.monotonic()
+
+    @property
+    def age(self):
+        if self.opened_at is None:
+            return None
+        return time.monotonic() - self.opened_at
+
+    @property
+    def idle_time(self):
+        if self.last_used_at is None:
+            return None
+        return time.monotonic() - self.last_used_at
+
+    def is_expired(self) -> bool:
+        """Whether the box has most likely already dropped the session."""
+        return self.cookie is None or self.idle_time >= self.idle_timeout
+
+    def is_renewed_since(self, generation) -> bool:
+        """Whether a fresh session was opened after the given generation."""
+        return self.generation != generation and not self.is_expired()
+
+    def renew_delay(self) -> float:
+        """Seconds left before the session should be renewed."""
+        if self.cookie is None:
+            return 0
+        return max(0, self.idle_timeout - self.renew_margin - self.idle_time)
+
+    def start_keep_alive(self, renew, release):
+        if self.keep_alive_window <= 0:
+            return
+        if self._keep_alive_task is None or self._keep_alive_task.done():
+            self._keep_alive_task = asyncio.create_task(
+                self._keep_alive(renew, release)
+            )
+
+    async def stop_keep_alive(self):
+        task = self._keep_alive_task
+        self._keep_alive_task = None
+        if task is None or task is asyncio.current_task():
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    async def _keep_alive(self, renew, release):
+        backoff = self.renew_margin
+        while True:
+            remaining = self.keep_alive_window
+            if self.last_activity_at is not None:
+                remaining -= time.monotonic() - self.last_activity_at
+            if remaining <= 0:
+                _LOGGER.debug("No recent activity, releasing the session")
+                if self.cookie is not None:
+                    try:
+                        await release()
+                    except SomfyException as exception:
+                        _LOGGER.debug("Failed to release session: %s", exception)
+                return
+            delay = self.renew_delay()
+            if delay > 0:
+                await asyncio.sleep(min(delay, remaining))
+                # The session may have been used in the meantime
+                continue
+            try:
+                _LOGGER.debug("Renewing session (age: %s)", self.age)
+                await renew()
+            except SomfyAuthException as exception:
+                # Retrying would only lock the box out (0x0904)
+                _LOGGER.error(
+                    "Stopped keeping the session, reconfigure the integration: %s",
+                    exception,
+                )
+                return
+            except SomfyException as exception:
+                _LOGGER.warning("Failed to renew session: %s", exception)
+            if self.renew_delay() == 0:
+                # No usable session came out of it, don't hammer the box
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, self.max_renew_backoff)
+            else:
+                backoff = self.renew_margin
@@ -2,3 +2,7 @@ class SomfyException(Exception):
     def __init__(self, message=None) -> None:
         self.message = message
         super().__init__(message)
+
+
+class SomfyAuthException(SomfyException):
+    """The box refused the credentials or the code, retrying won't help."""
@@ -0,0 +1,114 @@
+from dataclasses import dataclass, fields, replace
+from functools import lru_cache
+from html import unescape
+import re
+import string
+from xml.etree import ElementTree as ET
+
+# status.xml tag -> Status field
+_STATUS_FIELDS = {
+    "defaut0": "battery",
+    "defaut1": "radio",
+    "defaut2": "door",
+    "defaut3": "alarm",
+    "defaut4": "box",
+    "zone0": "zoneA",
+    "zone1": "zoneB",
+    "zone2": "zoneC",
+    "gsm": "gsm",
+    "recgsm": "recgsm",
+    "opegsm": "opegsm",
+    "camera": "camera",
+}
+
+_ELEMENT_REGEX = re.compile(r"<(\w+)>([^<]*)</\1>")
+_END_TAG = "</response>"
+# Defaulted, a missing zone would show an armed box as disarmed
+_REQUIRED_TAGS = frozenset(
+    ["zone0", "zone1", "zone2", "defaut0", "defaut1", "defaut2", "defaut3", "defaut4"]
+)
+
+# Non ASCII characters are dropped when encoding, this removes the remaining
+# non printable ones
+_NON_PRINTABLE_ASCII = dict.fromkeys(
+    code for code in range(128) if chr(code) not in string.printable
+)
+
+
+@dataclass(frozen=True, slots=True)
+class Status:
+    zoneA: str = "off"
+    zoneB: str = "off"
+    zoneC: str = "off"
+    battery: str = "ok"
+    radio: str = "ok"
+    door: str = "ok"
+    alarm: str = "ok"
+    box: str = "ok"
+    gsm: str = "gsm connect au rseau"
+    recgsm: str = "4"
+    opegsm: str = "orange"
+    camera: str = "disabled"
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+    def replace(self, **changes):
+        return replace(self, **changes)
+
+    def diff(self, previous) -> dict:
+        """Return the fields whose value changed since the previous snapshot."""
+        if previous is None:
+            return {name: getattr(self, name) for name in STATUS_FIELDS}
+        return {
+            name: value
+            for name in STATUS_FIELDS
+            if (value := getattr(self, name)) != getattr(previous, name)
+        }
+
+    def __str__(self):
+        return f"zoneA:{self.zoneA}, zoneB:{self.zoneB}, zoneC:{self.zoneC}, battery:{self.battery}, radio:{self.radio}, door:{self.door}, alarm:{self.alarm}, box:{self.box}, gsm:{self.gsm}, recgsm:{self.recgsm}, opegsm:{self.opegsm}, camera:{self.camera}"
+
+
+STATUS_FIELDS = tuple(field.name for field in fields(Status))
+
+
+@lru_cache(maxsize=64)
+def filter_ascii(value) -> str:
+    # The box keeps sending the same handful of values, cache them
+    if value is None:
+        return value
+    return (
+        value.encode("ascii", "ignore")
+        .decode("ascii")
+        .translate(_NON_PRINTABLE_ASCII)
+        .lower()
+    )
+
+
+def parse_status(content) -> Status:
+    """Decode status.xml, raise ET.ParseError if it is truncated or incomplete."""
+    values = {}
+    tags = set()
+    if content.rstrip().endswith(_END_TAG):
+        # status.xml is a flat list of <tag>text</tag>, a single scan is enough
+        for tag, text in _ELEMENT_REGEX.findall(content):
+            field = _STATUS_FIELDS.get(tag)
+            if field is not None:
+                if "&" in text:
+                    text = unescape(text)
+                values[field] = filter_ascii(text) if text else None
+                tags.add(tag)
+    if not _REQUIRED_TAGS <= tags:
+        # Not the expected layout or cut short, let ElementTree deal with it
+        values = {}
+        tags = set()
+        for child in ET.fromstring(content):
+            field = _STATUS_FIELDS.get(child.tag)
+            if field is not None:
+                values[field] = filter_ascii(child.text)
+                tags.add(child.tag)
+        missing = _REQUIRED_TAGS - tags
+        if missing:
+            raise ET.ParseError(f"Missing {', '.join(sorted(missing))}")
+    return Status(**values)
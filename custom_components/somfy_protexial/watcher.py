@@ -0,0 +1,112 @@
+import asyncio
+import logging
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    DOMAIN,
+    EVENT_ALARM_TRIGGERED,
+    EVENT_DOOR_CHANGED,
+    EVENT_ZONE_CHANGED,
+    WATCH_ERROR_DELAY,
+    WATCH_INTERVAL,
+    Zone,
+)
+from .coordinator import ProtexialCoordinator
+from .somfy_exception import SomfyException
+
+_LOGGER = logging.getLogger(__name__)
+
+ZONES_BY_FIELD = {"zoneA": Zone.A, "zoneB": Zone.B, "zoneC": Zone.C}
+WATCHED_FIELDS = frozenset([*ZONES_BY_FIELD, "alarm", "door"])
+
+
+class StatusWatcher:
+    """Fire events for alarm, door and zone transitions as soon as they happen.
+
+    status.xml is cheap to read once unchanged (304 or same body), so it is
+    read every WATCH_INTERVAL seconds during the activity window of the
+    scheduler, then at the poll interval as it backs off. Entities are only
+    updated when one of the watched fields changes.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: ProtexialCoordinator,
+        entry: ConfigEntry,
+        interval=WATCH_INTERVAL,
+    ) -> None:
+        self.hass = hass
+        self.coordinator = coordinator
+        self.entry = entry
+        self.entry_id = entry.entry_id
+        self.interval = interval
+        self._task = None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            # Cancelled by the config entry if still running once unloaded
+            self._task = self.entry.async_create_background_task(
+                self.hass, self._watch(), f"{DOMAIN} status watcher"
+            )
+
+    async def stop(self):
+        task = self._task
+        self._task = None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    async def _watch(self):
+        previous = self.coordinator.data
+        while True:
+            try:
+                status = await self.coordinator.protexial.get_status()
+            except SomfyException as exception:
+                _LOGGER.debug("Watcher failed to read status: %s", exception)
+                await asyncio.sleep(WATCH_ERROR_DELAY)
+                continue
+            except Exception:  # pylint: disable=broad-except
+                # Keep watching, the task would otherwise die silently
+                _LOGGER.exception("Unexpected error while watching the status")
+                await asyncio.sleep(WATCH_ERROR_DELAY)
+                continue
+            if previous is not None and status is not previous:
+                self.fire_events(status.diff(previous), status)
+                # A poll may already have published it
+                if not WATCHED_FIELDS.isdisjoint(status.diff(self.coordinator.data)):
+                    self.coordinator.async_set_watched_data(status)
+            previous = status
+            await asyncio.sleep(
+                self.coordinator.scheduler.watch_interval(self.interval)
+            )
+
+    def fire_events(self, changes, status):
+        for field, zone in ZONES_BY_FIELD.items():
+            if field in changes:
+                self.hass.bus.async_fire(
+                    EVENT_ZONE_CHANGED,
+                    {
+                        "entry_id": self.entry_id,
+                        "zone": zone.name,
+                        "state": status[field],
+                    },
+                )
+        if "alarm" in changes:
+            _LOGGER.debug("Alarm changed: %s", status.alarm)
+            if status.alarm != "ok":
+                self.hass.bus.async_fire(
+                    EVENT_ALARM_TRIGGERED,
+                    {"entry_id": self.entry_id, "state": status.alarm},
+                )
+        if "door" in changes:
+            self.hass.bus.async_fire(
+                EVENT_DOOR_CHANGED,
+                {"entry_id": self.entry_id, "state": status.door},
+            )
@@ -0,0 +1 @@
+"""Tests for the Somfy Protexial integration."""
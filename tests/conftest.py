@@ -0,0 +1,24 @@
+"""Fixtures for the Somfy Protexial tests."""
+
+from pathlib import Path
+import sys
+
+import pytest
+
+# The box simulator lives with the benchmarks
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "benchmarks"))
+
+from fake_box import FakeBox, create_app  # noqa: E402
+
+
+@pytest.fixture
+async def fake_box(aiohttp_server, socket_enabled):
+    """A simulated Protexial box on localhost, returns its URL and its state.
+
+    aiohttp's test server binds its socket up front, no address resolution
+    is left running in the executor when the test ends.
+    """
+    app = create_app()
+    box = app["boxes"][None] = FakeBox(seed=42)
+    server = await aiohttp_server(app)
+    return f"http://{server.host}:{server.port}", box
@@ -0,0 +1,42 @@
+"""Fast paths of the page extractors against the DOM selectors."""
+
+from pathlib import Path
+
+import pytest
+
+from custom_components.somfy_protexial.const import Selector
+from custom_components.somfy_protexial.html_parser import extract_text, parse_html
+from custom_components.somfy_protexial.protexial_api import ProtexialApi
+from custom_components.somfy_protexial.protexial_io_api import ProtexialIOApi
+from custom_components.somfy_protexial.protexiom_api import ProtexiomApi
+
+FIXTURES = Path(__file__).resolve().parents[1] / "benchmarks" / "fixtures"
+APIS = {
+    "protexial": ProtexialApi,
+    "protexial_io": ProtexialIOApi,
+    "protexiom": ProtexiomApi,
+}
+PAGES = [
+    ("login", Selector.LOGIN_CHALLENGE),
+    ("login", Selector.FOOTER),
+    ("error", Selector.ERROR_CODE),
+]
+
+
+@pytest.mark.parametrize("model", APIS)
+@pytest.mark.parametrize(("page", "selector"), PAGES)
+def test_extractor_matches_selector(model, page, selector):
+    api = APIS[model]()
+    content = (FIXTURES / model / f"{page}.htm").read_bytes().decode(api.encoding)
+    extractor = api.get_extractor(selector)
+    assert extractor.search(content) is not None
+    expected = parse_html(content)(api.get_selector(selector)).text()
+    assert extract_text(content, api.get_selector(selector), extractor) == expected
+
+
+def test_error_code_is_read_inside_the_infobox():
+    api = ProtexialApi()
+    content = '<div id="infobox"><p>Erreur</p></div><p><b>Footer</b></p>'
+    extractor = api.get_extractor(Selector.ERROR_CODE)
+    assert extractor.search(content) is None
+    assert extract_text(content, api.get_selector(Selector.ERROR_CODE), extractor) == ""
@@ -0,0 +1,69 @@
+"""Session handling against the simulated box."""
+
+import asyncio
+
+import pytest
+
+from custom_components.somfy_protexial.client_session import create_client_session
+from custom_components.somfy_protexial.const import ApiType
+from custom_components.somfy_protexial.protexial import SomfyProtexial
+
+PARALLEL_CALLS = 8
+
+
+@pytest.fixture
+async def protexial(fake_box):
+    url, box = fake_box
+    session = create_client_session()
+    protexial = SomfyProtexial(
+        session=session,
+        url=url,
+        api_type=ApiType.PROTEXIAL,
+        username=box.username,
+        password=box.password,
+        codes=box.card,
+    )
+    await protexial.init()
+    try:
+        yield protexial
+    finally:
+        await protexial.logout()
+        await session.close()
+
+
+@pytest.mark.parametrize("client_knows", [False, True])
+async def test_expired_session_logs_in_once(fake_box, protexial, client_knows):
+    """Parallel calls on an expired session share a single login."""
+    _, box = fake_box
+    # The box forgets the session
+    box.last_seen -= box.session_timeout + 1
+    if client_knows:
+        protexial.session_manager.last_used_at -= protexial.session_manager.idle_timeout
+    logins = box.login_posts
+
+    await asyncio.gather(
+        *(protexial.turn_light_on() for _ in range(PARALLEL_CALLS)),
+        *(protexial.get_elements() for _ in range(PARALLEL_CALLS)),
+    )
+
+    assert box.login_posts == logins + 1
+    assert box.light == "on"
+
+
+@pytest.mark.parametrize("window, extra_logins", [(5, 0), (0, 1)])
+async def test_keep_alive_window(fake_box, protexial, window, extra_logins):
+    """A command after an idle period only logs in again out of the window."""
+    _, box = fake_box
+    box.session_timeout = 0.2
+    manager = protexial.session_manager
+    manager.idle_timeout = box.session_timeout
+    manager.renew_margin = box.session_timeout / 2
+    manager.keep_alive_window = window
+    protexial.start_keep_alive()
+    logins = box.login_posts
+
+    await asyncio.sleep(box.session_timeout * 3)
+    await protexial.turn_light_on()
+
+    assert box.login_posts == logins + extra_logins
+    assert box.light == "on"
@@ -0,0 +1,43 @@
+"""Decoding of status.xml."""
+
+from pathlib import Path
+from xml.etree import ElementTree as ET
+
+import pytest
+
+from custom_components.somfy_protexial.status import parse_status
+
+FIXTURE = Path(__file__).resolve().parents[1] / "benchmarks" / "fixtures" / "status.xml"
+
+
+@pytest.fixture
+def content():
+    return (
+        FIXTURE.read_bytes()
+        .decode("iso-8859-1")
+        .replace("<zone0>off</zone0>", "<zone0>on</zone0>")
+    )
+
+
+def test_parse_status(content):
+    status = parse_status(content)
+    assert status.zoneA == "on"
+    assert status.zoneB == "off"
+    assert status.gsm == "gsm connect au rseau"
+
+
+@pytest.mark.parametrize("end", ["<zone0>on</z", "<zone0>on</zone0>", "</response"])
+def test_truncated_status_is_rejected(content, end):
+    """A document cut while the box reboots must not read as disarmed."""
+    with pytest.raises(ET.ParseError):
+        parse_status(content[: content.index(end) + len(end)])
+
+
+def test_missing_zone_is_rejected(content):
+    with pytest.raises(ET.ParseError):
+        parse_status(content.replace("<zone1>off</zone1>", ""))
+
+
+def test_tags_with_attributes(content):
+    status = parse_status(content.replace("<zone0>", '<zone0 id="A">'))
+    assert status.zoneA == "on"